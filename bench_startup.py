@@ -0,0 +1,57 @@
+"""
+Benchmark de inicialização: tempo até o primeiro quadro (time-to-first-frame).
+
+Lança o main.py algumas vezes com TETRIS_BENCH_STARTUP; o jogo imprime quanto
+levou até os imports, a janela e o primeiro quadro, e fecha sozinho.
+
+Uso:
+    python bench_startup.py              # 5 execuções
+    python bench_startup.py --runs 10
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+_LINE = re.compile(r"\[STARTUP\] (.*) ms")
+
+
+def run_once() -> dict | None:
+    env = dict(os.environ, TETRIS_BENCH_STARTUP=repr(time.time()))
+    proc = subprocess.run(
+        [sys.executable, "main.py"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    m = _LINE.search(proc.stdout)
+    if not m:
+        print("[STARTUP] execução sem medida:", (proc.stderr or proc.stdout).strip()[-500:])
+        return None
+    return {k: float(v) for k, v in (p.split("=") for p in m.group(1).split())}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mede o tempo até o primeiro quadro.")
+    parser.add_argument("--runs", type=int, default=5, help="quantas execuções")
+    args = parser.parse_args(argv)
+
+    results = [r for r in (run_once() for _ in range(args.runs)) if r]
+    if not results:
+        return 1
+    for key in results[0]:
+        values = [r[key] for r in results]
+        print(
+            f"[STARTUP] {key:<12} mediana {statistics.median(values):7.0f} ms"
+            f"  mín {min(values):7.0f} ms  máx {max(values):7.0f} ms"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
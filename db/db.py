@@ -1,20 +1,48 @@
 # tetris/db.py
 import os
+import time
 from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from dotenv import load_dotenv
+from . import metrics
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL não definido no .env")
 
-engine: Engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,
-    future=True,
-)
+# sem DATABASE_URL o jogo roda só com o armazenamento local (db/local_store.py);
+# as chamadas ao banco falham na hora e o repository trata como erro comum
+engine: Engine | None = None
+if DATABASE_URL:
+    engine = create_engine(
+        DATABASE_URL,
+        pool_pre_ping=True,
+        future=True,
+    )
+    metrics.instrument_engine(engine)
+
+def is_configured() -> bool:
+    return engine is not None
 
 def get_conn():
-    return engine.connect()
+    if engine is None:
+        metrics.record_error()
+        raise RuntimeError("DATABASE_URL não definido no .env")
+    # tempo de checkout do pool (com o pool_pre_ping) entra nas métricas
+    t0 = time.perf_counter()
+    try:
+        return engine.connect()
+    except Exception:
+        metrics.record_error()
+        raise
+    finally:
+        metrics.record_checkout(time.perf_counter() - t0)
+
+def ping() -> bool:
+    """O banco está acessível agora?"""
+    try:
+        with get_conn() as conn:
+            conn.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,469 @@
+# db/local_store.py
+"""
+Armazenamento local (SQLite) na frente do MySQL.
+
+Toda escrita da partida (início, save, pedaços de replay, fim de jogo) grava
+primeiro aqui, numa transação local rápida, e entra na `outbox`; o `db/sync.py`
+manda a outbox para o MySQL em lotes, em segundo plano. Se o banco cair ou não
+estiver configurado, nada se perde: a outbox espera e sincroniza depois.
+
+A partida nasce com um id local (tabela `games`); a op `start_game` cria a
+linha no MySQL e o sync guarda o id do servidor em `games.server_id`, usado
+para traduzir as ops seguintes da mesma partida.
+
+Os dados do próprio jogador (usuário, recorde, save ativo) também são lidos
+daqui. Quando ainda não há nada local, a leitura vai ao banco e guarda o
+resultado. Recorde e save são relidos do banco depois de REVALIDATE_TTL
+segundos, desde que o jogador não tenha escritas na outbox (aí o local é o
+mais novo): o que foi feito em outro fliperama aparece aqui também.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+import datetime as dt
+
+from tetris.core import replay_codec
+from . import repository
+
+LOCAL_DB_PATH = os.getenv(
+    "TETRIS_LOCAL_DB",
+    os.path.join(os.path.expanduser("~"), ".arcade_tetris", "local.db"),
+)
+# depois de tantas falhas isoladas, a operação é deixada de lado (dead = 1)
+MAX_ATTEMPTS = 5
+# por quanto tempo (segundos) recorde e save locais valem sem reler o banco
+REVALIDATE_TTL = float(os.getenv("TETRIS_REVALIDATE_TTL", "30"))
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        op TEXT NOT NULL,
+        user_id INTEGER,
+        game_id INTEGER,
+        seq INTEGER,
+        data BLOB,
+        meta TEXT NOT NULL DEFAULT '{}',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        dead INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_outbox_pending ON outbox(dead, id);
+    CREATE INDEX IF NOT EXISTS idx_outbox_user ON outbox(user_id, dead);
+
+    -- id local da partida -> id em `games` no MySQL (NULL até o sync)
+    CREATE TABLE IF NOT EXISTS games (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        rng_seed INTEGER,
+        started_at TEXT NOT NULL,
+        server_id INTEGER
+    );
+
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY,
+        username TEXT NOT NULL UNIQUE,
+        email TEXT,
+        password_hash TEXT NOT NULL
+    );
+
+    -- state NULL = sabemos que não há save ativo
+    CREATE TABLE IF NOT EXISTS saves (
+        user_id INTEGER PRIMARY KEY,
+        game_id INTEGER,
+        state BLOB,
+        is_json INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE TABLE IF NOT EXISTS high_scores (
+        user_id INTEGER PRIMARY KEY,
+        best_score INTEGER NOT NULL
+    );
+"""
+
+
+class LocalStore:
+    def __init__(self, path: str = LOCAL_DB_PATH):
+        self.path = path
+        # sqlite3 não compartilha conexão entre threads: uma por thread
+        self._local = threading.local()
+        # (o quê, user_id) -> quando foi conferido com o banco (monotonic)
+        self._checked: dict = {}
+        self._checked_lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            # WAL: leitores não bloqueiam o escritor; NORMAL basta para um log local
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---------- outbox ----------
+
+    def _append(self, conn, op: str, user_id=None, game_id=None, seq=None,
+                data: bytes | None = None, meta: dict | None = None) -> None:
+        meta = meta or {}
+        # partida cujo start_game já foi deixado de lado: a op nunca teria
+        # o id do servidor, então nasce morta (ver mark_failed)
+        dead = bool(meta.get("local_game")) and conn.execute(
+            "SELECT 1 FROM outbox WHERE op = 'start_game' AND game_id = ? AND dead = 1",
+            (game_id,),
+        ).fetchone() is not None
+        conn.execute(
+            "INSERT INTO outbox (op, user_id, game_id, seq, data, meta, dead, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (op, user_id, game_id, seq, data, json.dumps(meta), int(dead), time.time()),
+        )
+
+    def pending(self, limit: int) -> list[dict]:
+        rows = self._conn().execute(
+            "SELECT id, op, user_id, game_id, seq, data, meta, attempts "
+            "FROM outbox WHERE dead = 0 ORDER BY id LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [dict(r, meta=json.loads(r["meta"])) for r in rows]
+
+    def pending_count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM outbox WHERE dead = 0").fetchone()[0]
+
+    def pending_for(self, user_id: int) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM outbox WHERE user_id = ? AND dead = 0", (user_id,)
+        ).fetchone()[0]
+
+    # ---------- revalidação ----------
+
+    def should_revalidate(self, what: str, user_id: int) -> bool:
+        """
+        Vale reler `what` do banco? Só depois de REVALIDATE_TTL e sem escritas
+        pendentes do jogador (com elas, o dado local é o mais novo).
+        """
+        with self._checked_lock:
+            last = self._checked.get((what, user_id))
+        if last is not None and time.monotonic() - last < REVALIDATE_TTL:
+            return False
+        return self.pending_for(user_id) == 0
+
+    def mark_checked(self, what: str, user_id: int) -> None:
+        with self._checked_lock:
+            self._checked[(what, user_id)] = time.monotonic()
+
+    def remove(self, ids, server_ids: dict | None = None) -> None:
+        """
+        Tira da outbox as ops já aplicadas no banco e, na mesma transação,
+        guarda os ids do servidor das partidas criadas por elas.
+        """
+        with self._conn() as conn:
+            conn.executemany("DELETE FROM outbox WHERE id = ?", [(i,) for i in ids])
+            if server_ids:
+                conn.executemany(
+                    "UPDATE games SET server_id = ? WHERE id = ?",
+                    [(server, local) for local, server in server_ids.items()],
+                )
+
+    def server_ids(self, local_ids) -> dict:
+        """{id local: id no servidor} das partidas que já subiram."""
+        local_ids = list(set(local_ids))
+        if not local_ids:
+            return {}
+        marks = ", ".join("?" * len(local_ids))
+        rows = self._conn().execute(
+            f"SELECT id, server_id FROM games WHERE server_id IS NOT NULL AND id IN ({marks})",
+            local_ids,
+        ).fetchall()
+        return {r["id"]: r["server_id"] for r in rows}
+
+    def mark_failed(self, op_id: int) -> None:
+        """
+        Conta uma falha da op. Se um start_game é deixado de lado, as ops da
+        mesma partida vão junto: sem o id do servidor elas falhariam para sempre.
+        """
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, dead = (attempts + 1 >= ?) "
+                "WHERE id = ?",
+                (MAX_ATTEMPTS, op_id),
+            )
+            row = conn.execute(
+                "SELECT op, game_id, dead FROM outbox WHERE id = ?", (op_id,)
+            ).fetchone()
+            if row is None or not row["dead"] or row["op"] != "start_game":
+                return
+            dropped = conn.execute(
+                "UPDATE outbox SET dead = 1 "
+                "WHERE dead = 0 AND game_id = ? AND json_extract(meta, '$.local_game')",
+                (row["game_id"],),
+            ).rowcount
+        print(f"[LOCAL] start_game da partida local #{row['game_id']} desistiu; "
+              f"{dropped} operações dela também foram deixadas de lado")
+
+    # ---------- escritas ----------
+
+    def start_game(self, user_id: int, rng_seed: int | None) -> int:
+        """Registra a partida com um id local; a linha no MySQL vem pelo sync."""
+        started_at = dt.datetime.utcnow().isoformat()
+        with self._conn() as conn:
+            game_id = conn.execute(
+                "INSERT INTO games (user_id, rng_seed, started_at) VALUES (?, ?, ?)",
+                (user_id, rng_seed, started_at),
+            ).lastrowid
+            self._append(conn, "start_game", user_id, game_id,
+                         meta={"seed": rng_seed, "started_at": started_at})
+        return game_id
+
+    def save_game(self, user_id: int, game_id: int | None, state: bytes | dict) -> None:
+        if isinstance(state, (bytes, bytearray)):
+            data, is_json = bytes(state), 0
+        else:
+            data, is_json = json.dumps(state).encode("utf-8"), 1
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO saves (user_id, game_id, state, is_json) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET "
+                "game_id = excluded.game_id, state = excluded.state, is_json = excluded.is_json",
+                (user_id, game_id, data, is_json),
+            )
+            # só o último save importa: os anteriores ainda não enviados saem da fila
+            conn.execute(
+                "DELETE FROM outbox WHERE op = 'save' AND user_id = ? AND dead = 0",
+                (user_id,),
+            )
+            self._append(conn, "save", user_id, game_id, data=data,
+                         meta={"json": bool(is_json), "local_game": True})
+
+    def add_replay_chunk(self, game_id: int, seq: int, payload: bytes,
+                         user_id: int | None = None) -> None:
+        with self._conn() as conn:
+            self._append(conn, "replay_chunk", user_id, game_id, seq, payload,
+                         meta={"local_game": True})
+
+    def finish(self, game_id: int | None, user_id: int, meta: dict,
+               payload: bytes | None, seq: int | None) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO saves (user_id, game_id, state, is_json) VALUES (?, NULL, NULL, 0) "
+                "ON CONFLICT(user_id) DO UPDATE SET game_id = NULL, state = NULL",
+                (user_id,),
+            )
+            self._raise_best(conn, user_id, meta["score"])
+            if game_id is None:
+                # partida sem registro (nem o local deu certo): só o recorde sobe
+                self._append(conn, "high_score", user_id,
+                             meta={"score": meta["score"], "at": meta["finished_at"]})
+            else:
+                self._append(conn, "finalize", user_id, game_id, seq, payload,
+                             dict(meta, local_game=True))
+
+    def _raise_best(self, conn, user_id: int, score: int) -> None:
+        conn.execute(
+            "INSERT INTO high_scores (user_id, best_score) VALUES (?, ?) "
+            "ON CONFLICT(user_id) DO UPDATE SET best_score = MAX(best_score, excluded.best_score)",
+            (user_id, score),
+        )
+
+    def remember_user(self, user: dict) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO users (id, username, email, password_hash) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET username = excluded.username, "
+                "email = excluded.email, password_hash = excluded.password_hash",
+                (user["id"], user["username"], user.get("email"), user["password_hash"]),
+            )
+
+    def remember_best(self, user_id: int, score: int) -> None:
+        with self._conn() as conn:
+            self._raise_best(conn, user_id, score)
+
+    def remember_save(self, user_id: int, state: bytes | dict | None) -> None:
+        """
+        Guarda o save vindo do banco (None = sem save ativo), sem gerar
+        escrita na outbox. Substitui o local: só é chamado sem ops pendentes.
+        """
+        if state is None:
+            data, is_json = None, 0
+        elif isinstance(state, (bytes, bytearray)):
+            data, is_json = bytes(state), 0
+        else:
+            data, is_json = json.dumps(state).encode("utf-8"), 1
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO saves (user_id, game_id, state, is_json) VALUES (?, NULL, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET "
+                "game_id = NULL, state = excluded.state, is_json = excluded.is_json",
+                (user_id, data, is_json),
+            )
+
+    # ---------- leituras ----------
+
+    def user_by_id(self, user_id: int) -> dict | None:
+        row = self._conn().execute(
+            "SELECT id, username, email, password_hash FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def user_by_username(self, username: str) -> dict | None:
+        row = self._conn().execute(
+            "SELECT id, username, email, password_hash FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def best_score(self, user_id: int) -> int | None:
+        row = self._conn().execute(
+            "SELECT best_score FROM high_scores WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def active_save(self, user_id: int):
+        """(conhecido, save): conhecido = False quando não há registro local."""
+        row = self._conn().execute(
+            "SELECT state, is_json FROM saves WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        state = row["state"]
+        if state is None:
+            return True, None
+        if row["is_json"]:
+            return True, json.loads(state)
+        return True, bytes(state)
+
+
+_store: LocalStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> LocalStore:
+    """Armazenamento global, criado no primeiro uso."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = LocalStore()
+        return _store
+
+
+# ---------- API no formato do repository ----------
+
+def start_game(user_id: int, rng_seed: int | None) -> int | None:
+    """Id local da partida (o MySQL recebe a linha depois, pelo sync)."""
+    try:
+        return get_store().start_game(user_id, rng_seed)
+    except Exception as e:
+        print("[LOCAL] start_game falhou:", e)
+        return None
+
+def upsert_saved_game(user_id: int, game_id: int | None, state: bytes | dict) -> bool:
+    try:
+        get_store().save_game(user_id, game_id, state)
+        return True
+    except Exception as e:
+        print("[LOCAL] upsert_saved_game falhou:", e)
+        return False
+
+def save_replay_chunk(game_id: int | None, seq: int, chunk: dict,
+                      user_id: int | None = None) -> bool:
+    if game_id is None:
+        # sem registro da partida não há onde pendurar o replay; tentar de novo não ajuda
+        print(f"[LOCAL] save_replay_chunk: partida sem id, pedaço {seq} descartado")
+        return True
+    try:
+        get_store().add_replay_chunk(game_id, seq, replay_codec.encode_replay(chunk), user_id)
+        return True
+    except Exception as e:
+        print("[LOCAL] save_replay_chunk falhou:", e)
+        return False
+
+def finalize_game(game_id: int | None, user_id: int | None, final_score: int, lines: int,
+                  level: int, duration_ms: int, status: str = "completed",
+                  replay: dict | None = None, replay_seq: int | None = None) -> bool:
+    """Mesmo contrato de repository.finalize_game; o MySQL recebe depois, pelo sync."""
+    if user_id is None:
+        return True
+    meta = {
+        "score": final_score,
+        "lines": lines,
+        "level": level,
+        "duration_ms": duration_ms,
+        "status": status,
+        "finished_at": dt.datetime.utcnow().isoformat(),
+    }
+    payload = None if replay is None else replay_codec.encode_replay(replay)
+    try:
+        get_store().finish(game_id, user_id, meta, payload, replay_seq)
+        return True
+    except Exception as e:
+        print("[LOCAL] finalize_game falhou:", e)
+        return False
+
+def get_user_by_id(user_id: int):
+    try:
+        user = get_store().user_by_id(user_id)
+        if user is None:
+            user = repository.get_user_by_id(user_id)
+            if user:
+                get_store().remember_user(user)
+        return user
+    except Exception as e:
+        print("[LOCAL] get_user_by_id falhou:", e)
+        return repository.get_user_by_id(user_id)
+
+def get_user_best_score(user_id: int) -> int | None:
+    try:
+        store = get_store()
+        best = store.best_score(user_id)
+        if best is None or store.should_revalidate("best", user_id):
+            remote = repository.get_user_best_score(user_id)
+            store.mark_checked("best", user_id)
+            # recorde só sobe: vale o maior dos dois
+            if remote is not None and (best is None or remote > best):
+                store.remember_best(user_id, remote)
+                best = remote
+        return best
+    except Exception as e:
+        print("[LOCAL] get_user_best_score falhou:", e)
+        return repository.get_user_best_score(user_id)
+
+def load_active_save(user_id: int) -> bytes | dict | None:
+    try:
+        store = get_store()
+        known, state = store.active_save(user_id)
+        if not known or store.should_revalidate("save", user_id):
+            # "sem save" local não vale para sempre: o banco pode ter um mais novo
+            ok, remote = repository.fetch_active_save(user_id)
+            store.mark_checked("save", user_id)
+            if ok:
+                store.remember_save(user_id, remote)
+                state = remote
+        return state
+    except Exception as e:
+        print("[LOCAL] load_active_save falhou:", e)
+        return repository.load_active_save(user_id)
+
+def authenticate_user(username: str, plain_password: str):
+    """
+    Login pelo banco; o usuário fica guardado localmente para o próximo login
+    funcionar mesmo com o banco fora do ar.
+    """
+    user = repository.get_user_by_username(username)
+    if user is None:
+        try:
+            user = get_store().user_by_username(username)
+        except Exception as e:
+            print("[LOCAL] authenticate_user falhou:", e)
+    # confere e, se o custo do bcrypt mudou, refaz o hash
+    user = repository.check_password(user, plain_password)
+    if user is not None:
+        try:
+            get_store().remember_user(user)
+        except Exception as e:
+            print("[LOCAL] authenticate_user falhou:", e)
+    return user
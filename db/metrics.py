@@ -0,0 +1,271 @@
+# db/metrics.py
+"""
+Métricas do acesso ao banco.
+
+Cada função do repository marcada com `@timed` vira uma operação com
+histograma de latência, número de chamadas, linhas e erros. Os eventos do
+SQLAlchemy (`instrument_engine`) contam os comandos e erros de cada operação,
+e `get_conn` mede quanto custa pegar uma conexão do pool (inclui o
+pool_pre_ping).
+
+Operações mais lentas que `SLOW_QUERY_MS` (env DB_SLOW_QUERY_MS) são logadas
+com a quebra entre conexão e comandos. `snapshot()` devolve tudo em dict e
+`dump()` imprime uma tabela.
+"""
+import os
+import sys
+import time
+import bisect
+import functools
+import threading
+
+from sqlalchemy import event
+
+# limites superiores dos baldes do histograma (ms); o último balde é "acima disso"
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# acima disso (ms) a operação é logada; <= 0 desliga o log
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p: float) -> float:
+        """Aproximado: limite superior do balde onde cai o percentil (no máximo o máx. visto)."""
+        if not self.count:
+            return 0.0
+        target = p * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(float(BUCKETS_MS[i]), self.max_ms) if i < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "buckets": dict(zip([*map(str, BUCKETS_MS), "inf"], self.counts)),
+        }
+
+
+class OpStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.statements = 0
+        self.rows = 0
+        self.errors = 0
+        self.checkout_ms = 0.0
+        self.slow = 0
+
+    def to_dict(self) -> dict:
+        d = self.latency.to_dict()
+        d.update(
+            statements=self.statements,
+            rows=self.rows,
+            errors=self.errors,
+            checkout_ms=self.checkout_ms,
+            slow=self.slow,
+        )
+        return d
+
+
+_lock = threading.Lock()
+_ops: dict[str, OpStats] = {}
+_pool = {"checkouts": 0, "checkins": 0, "connects": 0, "invalidated": 0}
+_checkout = Histogram()
+_engine = None
+
+# operações em andamento no thread atual (uma função do repository chama outra)
+_local = threading.local()
+
+
+def _frames() -> list:
+    frames = getattr(_local, "frames", None)
+    if frames is None:
+        frames = _local.frames = []
+    return frames
+
+
+def _current() -> dict | None:
+    frames = _frames()
+    return frames[-1] if frames else None
+
+
+def timed(fn):
+    """Mede a função do repository como uma operação com o nome dela."""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        frame = {"checkout_ms": 0.0, "statements": 0, "stmt_ms": 0.0, "rows": 0, "errors": 0}
+        frames = _frames()
+        frames.append(frame)
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            ms = (time.perf_counter() - t0) * 1000.0
+            frames.pop()
+            if frames:
+                # a operação de fora também "viu" o que a de dentro fez
+                parent = frames[-1]
+                for k in frame:
+                    parent[k] += frame[k]
+            _finish(name, ms, frame)
+
+    return wrapper
+
+
+def _finish(name: str, ms: float, frame: dict) -> None:
+    slow = 0 < SLOW_QUERY_MS <= ms
+    with _lock:
+        st = _ops.get(name)
+        if st is None:
+            st = _ops[name] = OpStats()
+        st.latency.add(ms)
+        st.statements += frame["statements"]
+        st.rows += frame["rows"]
+        st.errors += frame["errors"]
+        st.checkout_ms += frame["checkout_ms"]
+        st.slow += slow
+    if slow:
+        print(
+            f"[DB] lento: {name} {ms:.1f} ms "
+            f"(conexão {frame['checkout_ms']:.1f} ms, "
+            f"{frame['statements']} comandos {frame['stmt_ms']:.1f} ms)"
+        )
+
+
+def record_checkout(seconds: float) -> None:
+    ms = seconds * 1000.0
+    with _lock:
+        _checkout.add(ms)
+    frame = _current()
+    if frame is not None:
+        frame["checkout_ms"] += ms
+
+
+def record_error() -> None:
+    frame = _current()
+    if frame is not None:
+        frame["errors"] += 1
+
+
+# ---------- eventos do SQLAlchemy ----------
+
+def instrument_engine(engine) -> None:
+    """Liga os eventos de comando e de pool no engine de db/db.py."""
+    global _engine
+    _engine = engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_metrics_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        t0 = conn.info["_metrics_t0"].pop()
+        frame = _current()
+        if frame is None:
+            return
+        frame["statements"] += 1
+        frame["stmt_ms"] += (time.perf_counter() - t0) * 1000.0
+        rowcount = getattr(cursor, "rowcount", -1)
+        if rowcount and rowcount > 0:
+            frame["rows"] += rowcount
+
+    @event.listens_for(engine, "handle_error")
+    def _error(ctx):
+        stack = ctx.connection.info.get("_metrics_t0") if ctx.connection is not None else None
+        if stack:
+            stack.pop()
+        record_error()
+
+    @event.listens_for(engine.pool, "connect")
+    def _connect(dbapi_conn, record):
+        with _lock:
+            _pool["connects"] += 1
+
+    @event.listens_for(engine.pool, "checkout")
+    def _pool_checkout(dbapi_conn, record, proxy):
+        with _lock:
+            _pool["checkouts"] += 1
+
+    @event.listens_for(engine.pool, "checkin")
+    def _pool_checkin(dbapi_conn, record):
+        with _lock:
+            _pool["checkins"] += 1
+
+    @event.listens_for(engine.pool, "invalidate")
+    def _invalidate(dbapi_conn, record, exc):
+        with _lock:
+            _pool["invalidated"] += 1
+
+
+def pool_stats() -> dict:
+    with _lock:
+        stats = dict(_pool)
+        # tempo de pegar conexão, pool_pre_ping incluso
+        stats["checkout"] = _checkout.to_dict()
+    pool = _engine.pool if _engine is not None else None
+    for key in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, key, None)
+        stats[key] = fn() if callable(fn) else None
+    return stats
+
+
+# ---------- API ----------
+
+def snapshot() -> dict:
+    with _lock:
+        ops = {name: st.to_dict() for name, st in _ops.items()}
+    return {"ops": ops, "pool": pool_stats(), "slow_query_ms": SLOW_QUERY_MS}
+
+
+def reset() -> None:
+    with _lock:
+        _ops.clear()
+        for k in _pool:
+            _pool[k] = 0
+        _checkout.__init__()
+
+
+def dump(file=None) -> None:
+    """Imprime as operações (mais tempo total primeiro) e o pool."""
+    file = file or sys.stdout
+    snap = snapshot()
+    ops = sorted(snap["ops"].items(), key=lambda kv: -kv[1]["count"] * kv[1]["avg_ms"])
+    print(f"{'operação':<26}{'n':>6}{'méd':>9}{'p95':>9}{'máx':>9}"
+          f"{'conexão':>10}{'cmds':>6}{'linhas':>8}{'erros':>7}{'lentas':>7}", file=file)
+    for name, d in ops:
+        print(
+            f"{name:<26}{d['count']:>6}{d['avg_ms']:>9.1f}{d['p95_ms']:>9.1f}{d['max_ms']:>9.1f}"
+            f"{d['checkout_ms']:>10.1f}{d['statements']:>6}{d['rows']:>8}{d['errors']:>7}{d['slow']:>7}",
+            file=file,
+        )
+    pool = snap["pool"]
+    co = pool["checkout"]
+    print(
+        f"pool: {pool['checkouts']} checkouts, {pool['connects']} conexões novas, "
+        f"{pool['invalidated']} invalidadas, em uso {pool['checkedout']}, "
+        f"overflow {pool['overflow']}, checkout méd {co['avg_ms']:.1f} ms / p95 {co['p95_ms']:.1f} ms",
+        file=file,
+    )
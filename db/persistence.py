@@ -0,0 +1,134 @@
+# db/persistence.py
+"""
+Fila de escrita em segundo plano (write-behind).
+
+As escritas no banco saem do loop de renderização: a view só enfileira e
+segue desenhando. Cada chave (ex.: o usuário) cai sempre no mesmo worker,
+então as escritas de uma mesma partida chegam na ordem em que foram
+enfileiradas. Uma escrita que falha (função retornou False ou levantou
+exceção) é repetida algumas vezes antes de desistir.
+
+Leituras também podem passar pela fila (`fetch`): com a mesma chave, a
+consulta roda depois das escritas já enfileiradas, então a tela vê o que
+acabou de ser gravado.
+"""
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+_STOP = object()
+
+
+class PersistenceQueue:
+    def __init__(self, workers: int = 2, retries: int = 3, backoff: float = 0.5):
+        self.retries = retries
+        self.backoff = backoff
+        # uma fila sem limite por worker: quem enfileira é o loop de
+        # renderização e nunca pode esperar; nenhuma escrita pode ser
+        # descartada (start_game, finalize), então não há política de corte
+        self._queues = [queue.Queue() for _ in range(workers)]
+        self._threads = [
+            threading.Thread(target=self._run, args=(q,), name=f"db-writer-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, key, fn, *args, **kwargs) -> None:
+        """Enfileira fn(*args, **kwargs); mesma chave = mesma ordem de execução."""
+        q = self._queues[hash(key) % len(self._queues)]
+        q.put((fn, args, kwargs))
+
+    def fetch(self, key, fn, *args, **kwargs) -> Future:
+        """
+        Roda a consulta fn(*args, **kwargs) num worker e devolve um Future com
+        o resultado. Leituras não são repetidas: se falhar, o Future guarda a exceção.
+        """
+        fut: Future = Future()
+
+        def job():
+            if not fut.set_running_or_notify_cancel():
+                return
+            try:
+                fut.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                fut.set_exception(e)
+
+        job.__name__ = getattr(fn, "__name__", "fetch")
+        self.submit(key, job)
+        return fut
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Espera tudo o que já foi enfileirado terminar. Retorna False se estourar o tempo."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for q in self._queues:
+            with q.all_tasks_done:
+                while q.unfinished_tasks:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    q.all_tasks_done.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        self.flush(timeout)
+        for q in self._queues:
+            q.put(_STOP)
+        for t in self._threads:
+            t.join(timeout)
+
+    def _run(self, q: queue.Queue) -> None:
+        while True:
+            job = q.get()
+            try:
+                if job is _STOP:
+                    return
+                self._execute(*job)
+            finally:
+                q.task_done()
+
+    def _execute(self, fn, args, kwargs) -> None:
+        name = getattr(fn, "__name__", repr(fn))
+        for attempt in range(self.retries + 1):
+            try:
+                # as funções do repository retornam False quando a escrita falha
+                if fn(*args, **kwargs) is not False:
+                    return
+            except Exception as e:
+                print(f"[DB] {name} falhou (tentativa {attempt + 1}):", e)
+            if attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt))
+        print(f"[DB] {name} desistiu após {self.retries + 1} tentativas")
+
+
+_writer: PersistenceQueue | None = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> PersistenceQueue:
+    """Fila global, criada no primeiro uso."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = PersistenceQueue()
+        return _writer
+
+
+def submit(key, fn, *args, **kwargs) -> None:
+    get_writer().submit(key, fn, *args, **kwargs)
+
+
+def fetch(key, fn, *args, **kwargs) -> Future:
+    return get_writer().fetch(key, fn, *args, **kwargs)
+
+
+def flush(timeout: float | None = None) -> bool:
+    """Hook de saída: garante que as escritas pendentes chegaram ao banco."""
+    if _writer is None:
+        return True
+    return _writer.flush(timeout)
+
+
+atexit.register(flush, 10.0)
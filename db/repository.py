@@ -1,22 +1,42 @@
 # tetris/repository.py
+import os
 import json
+import time
+import itertools
+import threading
 import datetime as dt
-import bcrypt
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 from sqlalchemy.exc import SQLAlchemyError
 from .db import get_conn
+from .metrics import timed
+from tetris.core import replay_codec
 
 # ---------- helpers de senha ----------
+
+# custo do bcrypt (log2 das rodadas); hashes com outro custo são refeitos no login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
 def hash_password(plain: str) -> str:
-    return bcrypt.hashpw(plain.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    import bcrypt  # só quando alguém loga/registra
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return bcrypt.hashpw(plain.encode("utf-8"), salt).decode("utf-8")
+
+def password_needs_rehash(hashed: str) -> bool:
+    # formato "$2b$12$...": o segundo campo é o custo
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
 
 def verify_password(plain: str, hashed: str) -> bool:
+    import bcrypt
     try:
         return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
     except Exception:
         return False
 
 # ---------- Usuários básicos ----------
+@timed
 def create_user(username: str, password_hash: str, email: str | None = None) -> int | None:
     sql = text("""
         INSERT INTO users (username, email, password_hash)
@@ -31,6 +51,7 @@ def create_user(username: str, password_hash: str, email: str | None = None) ->
         print("[DB] create_user falhou:", e)
         return None
 
+@timed
 def get_user_by_username(username: str):
     sql = text("SELECT id, username, email, password_hash FROM users WHERE username = :u")
     try:
@@ -41,6 +62,19 @@ def get_user_by_username(username: str):
         print("[DB] get_user_by_username falhou:", e)
         return None
 
+@timed
+def update_password_hash(user_id: int, password_hash: str) -> bool:
+    sql = text("UPDATE users SET password_hash = :p WHERE id = :id")
+    try:
+        with get_conn() as conn:
+            conn.execute(sql, {"p": password_hash, "id": user_id})
+            conn.commit()
+        return True
+    except Exception as e:
+        print("[DB] update_password_hash falhou:", e)
+        return False
+
+@timed
 def get_user_by_id(user_id: int):
     sql = text("SELECT id, username, email, password_hash FROM users WHERE id = :id")
     try:
@@ -52,6 +86,7 @@ def get_user_by_id(user_id: int):
         return None
 
 # ---------- APIs de auth de mais alto nível ----------
+@timed
 def create_user_account(username: str, plain_password: str, email: str | None = None):
     """
     Cria usuário novo.
@@ -70,50 +105,91 @@ def create_user_account(username: str, plain_password: str, email: str | None =
         return None, "Erro ao criar usuário no banco."
     return user_id, None
 
+@timed
 def authenticate_user(username: str, plain_password: str):
     """
     Retorna dict do user se login ok, senão None.
     """
-    user = get_user_by_username(username)
+    return check_password(get_user_by_username(username), plain_password)
+
+def check_password(user: dict | None, plain_password: str):
+    """
+    Confere a senha do user (dict com password_hash). Se o hash guardado foi
+    feito com outro custo, aproveita a senha em mãos para refazer com
+    BCRYPT_ROUNDS e gravar. Retorna o user (com o hash novo) ou None.
+    """
     if not user:
         return None
     if not verify_password(plain_password, user["password_hash"]):
         return None
+    if password_needs_rehash(user["password_hash"]):
+        new_hash = hash_password(plain_password)
+        # se o banco não aceitar agora, o próximo login tenta de novo
+        if update_password_hash(user["id"], new_hash):
+            user = dict(user, password_hash=new_hash)
     return user
 
 # ---------- Partidas / games ----------
-def start_game(user_id: int, rng_seed: int) -> int | None:
+@timed
+def start_game(user_id: int, rng_seed: int | None) -> int | None:
     """
     Cria um registro de jogo em andamento, salvando também a rng_seed
     que será usada depois no replay para recriar a mesma sequência de peças.
     """
-    sql = text("""
-        INSERT INTO games (user_id, started_at, rng_seed, status)
-        VALUES (:uid, :st, :seed, 'in_progress')
-    """)
-    now = dt.datetime.utcnow()
-
     try:
         with get_conn() as conn:
-            res = conn.execute(
-                sql,
-                {
-                    "uid": user_id,
-                    "st": now,
-                    "seed": rng_seed,
-                },
-            )
+            game_id = _insert_game(conn, user_id, rng_seed, dt.datetime.utcnow())
             conn.commit()
-            return res.lastrowid
+            return game_id
     except Exception as e:
         print("[DB] start_game falhou:", e)
         return None
 
+def _insert_game(conn, user_id: int, rng_seed: int | None, started_at: dt.datetime) -> int:
+    sql = text("""
+        INSERT INTO games (user_id, started_at, rng_seed, status)
+        VALUES (:uid, :st, :seed, 'in_progress')
+    """)
+    res = conn.execute(sql, {"uid": user_id, "st": started_at, "seed": rng_seed})
+    return res.lastrowid
+
 def finish_game(game_id: int | None, user_id: int | None, final_score: int, lines: int,
-                level: int, duration_ms: int, status: str = "completed") -> None:
+                level: int, duration_ms: int, status: str = "completed") -> bool:
+    # compatibilidade; sem @timed para não contar o fim de partida duas vezes
+    return finalize_game(game_id, user_id, final_score, lines, level, duration_ms, status)
+
+@timed
+def finalize_game(game_id: int | None, user_id: int | None, final_score: int, lines: int,
+                  level: int, duration_ms: int, status: str = "completed",
+                  replay: dict | None = None, replay_seq: int | None = None) -> bool:
+    """
+    Fecha a partida numa transação só: UPDATE em games, ranking, recorde
+    (upsert atômico), desativa o save e grava o replay. Se qualquer parte
+    falhar, nada fica pela metade.
+
+    `replay` com `replay_seq` é o último pedaço do replay (game_replay_chunks);
+    sem `replay_seq`, é o replay inteiro (game_replays).
+    """
     if game_id is None or user_id is None:
-        return
+        return True
 
+    now = dt.datetime.utcnow()
+    try:
+        with get_conn() as conn:
+            _finalize_game(conn, game_id, user_id, final_score, lines, level,
+                           duration_ms, status, replay, replay_seq, now)
+            conn.commit()
+        if status == "completed":
+            _leaderboard_cache_add(user_id, final_score, lines, level, now)
+        return True
+    except Exception as e:
+        print("[DB] finalize_game falhou:", e)
+        return False
+
+def _finalize_game(conn, game_id: int, user_id: int, final_score: int, lines: int,
+                   level: int, duration_ms: int, status: str,
+                   replay: dict | bytes | None, replay_seq: int | None,
+                   now: dt.datetime) -> None:
     sql = text("""
         UPDATE games
         SET finished_at = :fin,
@@ -124,73 +200,95 @@ def finish_game(game_id: int | None, user_id: int | None, final_score: int, line
             status = :st
         WHERE id = :gid
     """)
-    now = dt.datetime.utcnow()
-    try:
-        with get_conn() as conn:
-            conn.execute(sql, {
-                "fin": now, "score": final_score, "lines": lines,
-                "lvl": level, "dur": duration_ms, "st": status, "gid": game_id
-            })
-            conn.commit()
-        # depois de atualizar o game, atualiza high score
-        update_high_score(user_id, final_score)
-        # limpa save ativo dessa partida/usuário, se tiver
-        clear_active_save(user_id)
-    except Exception as e:
-        print("[DB] finish_game falhou:", e)
+    conn.execute(sql, {
+        "fin": now, "score": final_score, "lines": lines,
+        "lvl": level, "dur": duration_ms, "st": status, "gid": game_id
+    })
+    if status == "completed":
+        _record_leaderboard(conn, game_id, user_id, final_score, lines, level, now)
+    _upsert_high_score(conn, user_id, final_score, now)
+    # limpa save ativo dessa partida/usuário, se tiver
+    _clear_active_save(conn, user_id)
+    if replay is not None:
+        payload = _replay_payload(replay)
+        if replay_seq is None:
+            _insert_replay(conn, game_id, payload)
+        else:
+            _insert_replay_chunk(conn, game_id, replay_seq, payload)
 
 # ---------- High score ----------
 
-def update_high_score(user_id: int, score: int) -> None:
-    sql_select = text("""
-        SELECT best_score FROM user_high_scores WHERE user_id = :uid
-    """)
-    sql_insert = text("""
+def _upsert_high_score(conn, user_id: int, score: int, at: dt.datetime) -> None:
+    # um comando só: sem a corrida entre SELECT e INSERT/UPDATE.
+    # best_score_at vem antes porque o MySQL aplica as atribuições em ordem
+    sql = text("""
         INSERT INTO user_high_scores (user_id, best_score, best_score_at)
         VALUES (:uid, :score, :at)
+        ON DUPLICATE KEY UPDATE
+            best_score_at = IF(VALUES(best_score) > best_score, VALUES(best_score_at), best_score_at),
+            best_score = GREATEST(best_score, VALUES(best_score))
     """)
-    sql_update = text("""
-        UPDATE user_high_scores
-        SET best_score = :score, best_score_at = :at
-        WHERE user_id = :uid
-    """)
+    conn.execute(sql, {"uid": user_id, "score": score, "at": at})
 
-    now = dt.datetime.utcnow()
+@timed
+def update_high_score(user_id: int, score: int) -> bool:
     try:
         with get_conn() as conn:
-            row = conn.execute(sql_select, {"uid": user_id}).first()
-            if not row:
-                conn.execute(sql_insert, {"uid": user_id, "score": score, "at": now})
-            else:
-                current = row[0]
-                if score > current:
-                    conn.execute(sql_update, {"uid": user_id, "score": score, "at": now})
+            _upsert_high_score(conn, user_id, score, dt.datetime.utcnow())
             conn.commit()
+        return True
     except Exception as e:
         print("[DB] update_high_score falhou:", e)
+        return False
 
 # ---------- Saves ----------
-def upsert_saved_game(user_id: int, game_id: int | None, state: dict) -> None:
-    payload = json.dumps(state)
+@timed
+def upsert_saved_game(user_id: int, game_id: int | None, state: bytes | dict) -> bool:
+    """
+    `state` é o save binário do save_codec; um dict ainda é aceito
+    e vai para a coluna JSON (formato antigo / depuração).
+    """
+    try:
+        with get_conn() as conn:
+            _upsert_saved_game(conn, user_id, game_id, state)
+            conn.commit()
+        return True
+    except Exception as e:
+        print("[DB] upsert_saved_game falhou:", e)
+        return False
+
+def _upsert_saved_game(conn, user_id: int, game_id: int | None, state: bytes | dict) -> None:
+    if isinstance(state, (bytes, bytearray)):
+        payload, blob = None, bytes(state)
+    else:
+        payload, blob = json.dumps(state), None
     sql = text("""
-        INSERT INTO saved_games (user_id, game_id, state_json, is_active)
-        VALUES (:uid, :gid, CAST(:js AS JSON), 1)
+        INSERT INTO saved_games (user_id, game_id, state_json, state_bin, is_active)
+        VALUES (:uid, :gid, CAST(:js AS JSON), :bin, 1)
         ON DUPLICATE KEY UPDATE
             game_id = VALUES(game_id),
             state_json = VALUES(state_json),
+            state_bin = VALUES(state_bin),
             is_active = 1,
             updated_at = CURRENT_TIMESTAMP
     """)
-    try:
-        with get_conn() as conn:
-            conn.execute(sql, {"uid": user_id, "gid": game_id, "js": payload})
-            conn.commit()
-    except Exception as e:
-        print("[DB] upsert_saved_game falhou:", e)
+    conn.execute(sql, {"uid": user_id, "gid": game_id, "js": payload, "bin": blob})
 
-def load_active_save(user_id: int) -> dict | None:
+def load_active_save(user_id: int) -> bytes | dict | None:
+    """
+    Retorna o save binário (bytes) ou, para saves antigos, o dict do JSON.
+    Os dois formatos são aceitos por state_codec.state_to_game.
+    """
+    return fetch_active_save(user_id)[1]
+
+@timed
+def fetch_active_save(user_id: int) -> tuple[bool, bytes | dict | None]:
+    """
+    (ok, save): ok = False quando a consulta falhou, para quem precisa
+    distinguir "não há save" de "não deu para ler" (o armazenamento local).
+    """
     sql = text("""
-        SELECT state_json
+        SELECT state_json, state_bin
         FROM saved_games
         WHERE user_id = :uid AND is_active = 1
         ORDER BY updated_at DESC
@@ -200,78 +298,375 @@ def load_active_save(user_id: int) -> dict | None:
         with get_conn() as conn:
             row = conn.execute(sql, {"uid": user_id}).first()
             if not row:
-                return None
+                return True, None
+            if row[1] is not None:
+                return True, bytes(row[1])
             val = row[0]
             if isinstance(val, str):
-                return json.loads(val)
-            return val
+                return True, json.loads(val)
+            return True, val
     except Exception as e:
-        print("[DB] load_active_save falhou:", e)
-        return None
+        print("[DB] fetch_active_save falhou:", e)
+        return False, None
 
-def clear_active_save(user_id: int) -> None:
+def _clear_active_save(conn, user_id: int) -> None:
     sql = text("""
         UPDATE saved_games
         SET is_active = 0
         WHERE user_id = :uid AND is_active = 1
     """)
+    conn.execute(sql, {"uid": user_id})
+
+@timed
+def clear_active_save(user_id: int) -> bool:
     try:
         with get_conn() as conn:
-            conn.execute(sql, {"uid": user_id})
+            _clear_active_save(conn, user_id)
             conn.commit()
+        return True
     except Exception as e:
         print("[DB] clear_active_save falhou:", e)
+        return False
 
 # ---------- Replay ----------
-def save_replay(game_id: int | None, replay_events: list[dict]) -> None:
-    if game_id is None:
-        return
-    payload = json.dumps(replay_events)
+def _replay_payload(replay: dict | bytes) -> bytes:
+    # o armazenamento local já guarda o replay codificado
+    if isinstance(replay, (bytes, bytearray)):
+        return bytes(replay)
+    return replay_codec.encode_replay(replay)
+
+def _insert_replay(conn, game_id: int, payload: bytes) -> None:
     sql = text("""
         INSERT INTO game_replays (game_id, replay_data)
         VALUES (:gid, :data)
     """)
+    conn.execute(sql, {"gid": game_id, "data": payload})
+
+def _insert_replay_chunk(conn, game_id: int, seq: int, payload: bytes) -> None:
+    sql = text("""
+        INSERT INTO game_replay_chunks (game_id, seq, chunk_data)
+        VALUES (:gid, :seq, :data)
+        ON DUPLICATE KEY UPDATE chunk_data = VALUES(chunk_data)
+    """)
+    conn.execute(sql, {"gid": game_id, "seq": seq, "data": payload})
+
+@timed
+def save_replay(game_id: int | None, replay: dict, compression: str = "zlib") -> bool:
+    """
+    Salva o replay no formato binário (replay_codec).
+    `replay` é o dict {"ticks", "keys", "keyframes"} do ReplayRecorder.
+    """
+    if game_id is None:
+        return True
+    payload = replay_codec.encode_replay(replay, compression)
     try:
         with get_conn() as conn:
-            conn.execute(sql, {"gid": game_id, "data": payload})
+            _insert_replay(conn, game_id, payload)
             conn.commit()
+        return True
     except Exception as e:
         print("[DB] save_replay falhou:", e)
+        return False
 
-def load_replay(game_id: int) -> list[dict] | None:
-    sql = text("SELECT replay_data FROM game_replays WHERE game_id = :gid")
+@timed
+def save_replay_chunk(game_id: int | None, seq: int, chunk: dict | bytes) -> bool:
+    """
+    Grava um pedaço do replay enquanto a partida roda.
+    Se o jogo cair no meio, o que já foi enviado continua no banco.
+    """
+    if game_id is None:
+        return True
+    payload = _replay_payload(chunk)
     try:
         with get_conn() as conn:
-            row = conn.execute(sql, {"gid": game_id}).first()
-            if not row:
-                return None
-            return json.loads(row[0])
+            _insert_replay_chunk(conn, game_id, seq, payload)
+            conn.commit()
+        return True
+    except Exception as e:
+        print("[DB] save_replay_chunk falhou:", e)
+        return False
+
+def iter_replay_chunks(game_id: int):
+    """
+    Lê os pedaços do replay em ordem, um por vez (cursor em streaming),
+    sem carregar todos os blobs na memória. Um erro no meio da leitura
+    sobe para quem consome: replay pela metade não pode parecer completo.
+    """
+    sql = text("""
+        SELECT chunk_data
+        FROM game_replay_chunks
+        WHERE game_id = :gid
+        ORDER BY seq
+    """)
+    with get_conn() as conn:
+        result = conn.execution_options(stream_results=True).execute(sql, {"gid": game_id})
+        for row in result:
+            yield replay_codec.decode_replay(row[0])
+
+def iter_replay(game_id: int):
+    """
+    Replay em pedaços, na ordem: o replay inteiro (game_replays), se houver,
+    senão os pedaços gravados durante a partida. Nada sai se não há replay;
+    erros de leitura levantam exceção.
+    """
+    sql = text("SELECT replay_data FROM game_replays WHERE game_id = :gid")
+    with get_conn() as conn:
+        row = conn.execute(sql, {"gid": game_id}).first()
+    if row:
+        yield replay_codec.decode_replay(row[0])
+        return
+    yield from iter_replay_chunks(game_id)
+
+@timed
+def load_replay(game_id: int) -> dict | None:
+    """
+    Retorna o replay inteiro em memória, {"ticks": array, "keys": array,
+    "keyframes": list}, para a tela de replay (que pula no tempo).
+    Aceita o replay inteiro (binário novo ou JSON antigo) ou os pedaços
+    gravados durante a partida. None se não há replay ou a leitura falhou.
+    Para percorrer uma vez só, sem juntar tudo, use iter_replay.
+    """
+    try:
+        chunks = iter_replay(game_id)
+        first = next(chunks, None)
+        if first is None:
+            return None
+        return replay_codec.concat_replays(itertools.chain([first], chunks))
     except Exception as e:
         print("[DB] load_replay falhou:", e)
         return None
 
+# ---------- Sincronização do armazenamento local ----------
+
+@timed
+def apply_local_writes(ops: list[dict], game_ids: dict | None = None) -> bool:
+    """
+    Aplica um lote de escritas vindas do armazenamento local (db/local_store.py)
+    numa transação só: ou o lote inteiro entra, ou nada entra.
+    Cada op tem "op", "user_id", "game_id", "seq", "data" (bytes) e "meta" (dict).
+
+    Ops com meta["local_game"] trazem o id local da partida: `game_ids`
+    ({id local: id no servidor}) traduz, e cada "start_game" do lote cria a
+    linha em games e acrescenta o id novo ao dict (só se o lote entrar).
+    """
+    game_ids = {} if game_ids is None else game_ids
+    created = {}
+    finished = False
+
+    def server_game(op, required=True):
+        if not op["meta"].get("local_game"):
+            return op["game_id"]
+        gid = created.get(op["game_id"], game_ids.get(op["game_id"]))
+        if gid is None and required:
+            raise ValueError(f"partida local {op['game_id']} ainda sem id no servidor")
+        return gid
+
+    try:
+        with get_conn() as conn:
+            for op in ops:
+                kind, meta = op["op"], op["meta"]
+                if kind == "start_game":
+                    created[op["game_id"]] = _insert_game(
+                        conn, op["user_id"], meta["seed"],
+                        dt.datetime.fromisoformat(meta["started_at"]),
+                    )
+                elif kind == "save":
+                    state = json.loads(op["data"]) if meta.get("json") else op["data"]
+                    # o save não depende da partida: sem id no servidor, vai sem ele
+                    _upsert_saved_game(conn, op["user_id"], server_game(op, required=False), state)
+                elif kind == "replay_chunk":
+                    _insert_replay_chunk(conn, server_game(op), op["seq"], op["data"])
+                elif kind == "finalize":
+                    now = dt.datetime.fromisoformat(meta["finished_at"])
+                    _finalize_game(conn, server_game(op), op["user_id"], meta["score"],
+                                   meta["lines"], meta["level"], meta["duration_ms"],
+                                   meta["status"], op["data"], op["seq"], now)
+                    finished = finished or meta["status"] == "completed"
+                elif kind == "high_score":
+                    _upsert_high_score(conn, op["user_id"], meta["score"],
+                                       dt.datetime.fromisoformat(meta["at"]))
+                else:
+                    raise ValueError(f"operação local desconhecida: {kind}")
+            conn.commit()
+        game_ids.update(created)
+        # um lote pode trazer muitas partidas (inclusive antigas, de quando o
+        # banco estava fora): mais simples descartar o cache do que remendar
+        if finished:
+            invalidate_leaderboard_cache()
+        return True
+    except Exception as e:
+        print("[DB] apply_local_writes falhou:", e)
+        return False
+
 # ---------- Ranking ----------
 
-def get_global_leaderboard(limit: int = 10):
+# janelas do ranking materializado (tabela `leaderboard`); "all" usa uma data fixa
+LEADERBOARD_PERIODS = ("all", "day", "week")
+_ALL_TIME_START = dt.date(1970, 1, 1)
+# quantas partidas cada janela guarda; o resto é podado a cada partida concluída
+LEADERBOARD_SIZE = 100
+
+# por quanto tempo (segundos) o top N fica em memória; 0 desliga o cache
+LEADERBOARD_TTL = float(os.getenv("LEADERBOARD_TTL", "30"))
+
+# top N em memória por janela (período, início): as linhas, quantas foram
+# pedidas e quando vieram do banco
+_leaderboard_lock = threading.Lock()
+_leaderboard_cache: dict = {}
+# muda a cada escrita: uma consulta que cruzou com uma escrita não vai pro cache
+_leaderboard_gen = 0
+
+
+def leaderboard_window(period: str, when: dt.datetime | None = None) -> tuple[str, dt.date]:
+    """(período, data de início) da janela que contém `when` (UTC)."""
+    if period not in LEADERBOARD_PERIODS:
+        raise ValueError(f"período de ranking desconhecido: {period}")
+    if period == "all":
+        return period, _ALL_TIME_START
+    day = (when or dt.datetime.utcnow()).date()
+    if period == "day":
+        return period, day
+    return period, day - dt.timedelta(days=day.weekday())  # semana começa na segunda
+
+
+def invalidate_leaderboard_cache() -> None:
+    """
+    Descarta o top N em memória (a próxima leitura vai ao banco). Escritas
+    feitas por outro processo não passam por aqui: essas aparecem quando o
+    LEADERBOARD_TTL vence.
+    """
+    global _leaderboard_gen
+    with _leaderboard_lock:
+        _leaderboard_cache.clear()
+        _leaderboard_gen += 1
+
+
+# as janelas entram num INSERT só e são podadas num DELETE só
+_WINDOWS_SQL = " UNION ALL ".join(
+    f"SELECT :p{i} AS period, :s{i} AS period_start" for i in range(len(LEADERBOARD_PERIODS))
+)
+_WINDOW_KEYS_SQL = ", ".join(f"(:p{i}, :s{i})" for i in range(len(LEADERBOARD_PERIODS)))
+
+_SQL_LEADERBOARD_INSERT = text(f"""
+    INSERT INTO leaderboard (period, period_start, game_id, user_id, username,
+                             final_score, lines_cleared, level_reached, finished_at)
+    SELECT w.period, w.period_start, :gid, u.id, u.username, :score, :lines, :lvl, :fin
+    FROM users u
+    CROSS JOIN ({_WINDOWS_SQL}) w
+    WHERE u.id = :uid
+    ON DUPLICATE KEY UPDATE final_score = VALUES(final_score),
+                            lines_cleared = VALUES(lines_cleared),
+                            level_reached = VALUES(level_reached),
+                            finished_at = VALUES(finished_at)
+""")
+
+# a tabela derivada (com a função de janela) é materializada antes do DELETE,
+# por isso pode ler a própria leaderboard
+_SQL_LEADERBOARD_TRIM = text(f"""
+    DELETE l FROM leaderboard l
+    JOIN (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY period, period_start
+                                      ORDER BY final_score DESC, finished_at ASC) AS pos
+        FROM leaderboard
+        WHERE (period, period_start) IN ({_WINDOW_KEYS_SQL})
+    ) ranked ON ranked.id = l.id
+    WHERE ranked.pos > :size
+""")
+
+
+def _record_leaderboard(conn, game_id: int, user_id: int, score: int, lines: int,
+                        level: int, finished_at: dt.datetime) -> None:
+    """
+    Atualiza as janelas do ranking com uma partida concluída, na mesma
+    transação do UPDATE em games: um INSERT para todas as janelas e um
+    DELETE que poda cada uma para LEADERBOARD_SIZE.
+    """
+    windows = {}
+    for i, period in enumerate(LEADERBOARD_PERIODS):
+        windows[f"p{i}"], windows[f"s{i}"] = leaderboard_window(period, finished_at)
+    conn.execute(_SQL_LEADERBOARD_INSERT, {
+        **windows, "gid": game_id, "uid": user_id,
+        "score": score, "lines": lines, "lvl": level, "fin": finished_at,
+    })
+    conn.execute(_SQL_LEADERBOARD_TRIM, {**windows, "size": LEADERBOARD_SIZE})
+
+
+def _leaderboard_cache_add(user_id: int, score: int, lines: int, level: int,
+                           finished_at: dt.datetime) -> None:
+    """
+    Partida concluída: em cada janela em cache que contém a partida e em que
+    ela entra no top N, a linha é inserida no lugar certo. Sem o nome do
+    usuário à mão (ele não está no cache), aquela janela é descartada.
+    """
+    global _leaderboard_gen
+    with _leaderboard_lock:
+        _leaderboard_gen += 1
+        for period in LEADERBOARD_PERIODS:
+            key = leaderboard_window(period, finished_at)
+            entry = _leaderboard_cache.get(key)
+            if entry is None:
+                continue
+            rows, limit = entry["rows"], entry["limit"]
+            # empate fica atrás (finished_at ASC): só entra se superar o último
+            if len(rows) >= limit and score <= rows[-1]["final_score"]:
+                continue
+            username = next((r["username"] for r in rows if r["user_id"] == user_id), None)
+            if username is None:
+                del _leaderboard_cache[key]
+                continue
+            pos = next((i for i, r in enumerate(rows) if r["final_score"] < score), len(rows))
+            rows.insert(pos, {
+                "user_id": user_id,
+                "username": username,
+                "final_score": score,
+                "lines_cleared": lines,
+                "level_reached": level,
+                "finished_at": finished_at,
+            })
+            del rows[limit:]
+
+
+@timed
+def get_global_leaderboard(limit: int = 10, period: str = "all"):
+    """
+    Top `limit` da janela atual ("all", "day" ou "week"), lido direto do
+    índice da tabela `leaderboard` (no máximo LEADERBOARD_SIZE linhas).
+    """
+    key = leaderboard_window(period)
+    with _leaderboard_lock:
+        entry = _leaderboard_cache.get(key)
+        if (entry is not None and limit <= entry["limit"]
+                and time.monotonic() - entry["at"] < LEADERBOARD_TTL):
+            return [dict(r) for r in entry["rows"][:limit]]
+        gen = _leaderboard_gen
+
     sql = text("""
-        SELECT u.username, g.final_score, g.lines_cleared, g.level_reached, g.finished_at
-        FROM games g
-        JOIN users u ON u.id = g.user_id
-        WHERE g.status = 'completed'
-        ORDER BY g.final_score DESC, g.finished_at ASC
+        SELECT user_id, username, final_score, lines_cleared, level_reached, finished_at
+        FROM leaderboard
+        WHERE period = :period AND period_start = :start
+        ORDER BY final_score DESC, finished_at ASC
         LIMIT :lim
     """)
     try:
         with get_conn() as conn:
-            rows = conn.execute(sql, {"lim": limit}).mappings().all()
-            return [dict(r) for r in rows]
+            rows = [
+                dict(r) for r in conn.execute(
+                    sql, {"period": key[0], "start": key[1], "lim": limit}
+                ).mappings().all()
+            ]
     except Exception as e:
         print("[DB] get_global_leaderboard falhou:", e)
         return []
 
+    with _leaderboard_lock:
+        if _leaderboard_gen == gen:
+            _leaderboard_cache[key] = {"rows": rows, "limit": limit, "at": time.monotonic()}
+    return [dict(r) for r in rows]
+
 
 # ---------- Melhor score de um usuário ----------
 
+@timed
 def get_user_best_score(user_id: int) -> int | None:
     sql = text("SELECT best_score FROM user_high_scores WHERE user_id = :uid")
     try:
@@ -286,6 +681,7 @@ def get_user_best_score(user_id: int) -> int | None:
 
 # ---------- Partidas recentes de um usuário (pra replay) ----------
 
+@timed
 def get_user_recent_games(user_id: int, limit: int = 10):
     sql = text("""
         SELECT id, final_score, lines_cleared, level_reached, finished_at
@@ -303,6 +699,7 @@ def get_user_recent_games(user_id: int, limit: int = 10):
         return []
 
 
+@timed
 def get_game_rng_seed(game_id: int) -> int | None:
     """
     Busca a rng_seed salva para um game específico.
@@ -324,4 +721,38 @@ def get_game_rng_seed(game_id: int) -> int | None:
             return row[0]
     except Exception as e:
         print("[DB] get_game_rng_seed falhou:", e)
-        return None
\ No newline at end of file
+        return None
+
+
+# ---------- Auditoria de replays ----------
+
+@timed
+def get_completed_games(limit: int | None = None, game_ids: list[int] | None = None):
+    """
+    Lista partidas concluídas com os números gravados (score, linhas, nível).
+    Se game_ids vier, busca só esses jogos; senão, os mais recentes até `limit`.
+    """
+    sql = """
+        SELECT id, rng_seed, final_score, lines_cleared, level_reached
+        FROM games
+        WHERE status = 'completed'
+    """
+    params = {}
+    if game_ids:
+        sql += " AND id IN :ids"
+        params["ids"] = list(game_ids)
+    sql += " ORDER BY id DESC"
+    if limit is not None:
+        sql += " LIMIT :lim"
+        params["lim"] = limit
+
+    stmt = text(sql)
+    if game_ids:
+        stmt = stmt.bindparams(bindparam("ids", expanding=True))
+    try:
+        with get_conn() as conn:
+            rows = conn.execute(stmt, params).mappings().all()
+            return [dict(r) for r in rows]
+    except Exception as e:
+        print("[DB] get_completed_games falhou:", e)
+        return []
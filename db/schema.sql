@@ -40,7 +40,8 @@ CREATE TABLE saved_games (
                              id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
                              user_id BIGINT UNSIGNED NOT NULL,
                              game_id BIGINT UNSIGNED NULL,
-                             state_json JSON NOT NULL,
+                             state_json JSON NULL,     -- formato antigo / depuração
+                             state_bin BLOB NULL,      -- save binário (save_codec)
                              is_active TINYINT(1) NOT NULL DEFAULT 1,
                              created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                              updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
@@ -55,12 +56,14 @@ CREATE TABLE saved_games (
 
 CREATE INDEX idx_saved_user_active
     ON saved_games(user_id, is_active);
+-- bancos já existentes:
+--   ALTER TABLE saved_games MODIFY state_json JSON NULL, ADD COLUMN state_bin BLOB NULL AFTER state_json;
 
 -- 4) Replays
 CREATE TABLE game_replays (
                               id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
                               game_id BIGINT UNSIGNED NOT NULL,
-                              replay_data LONGTEXT NOT NULL, -- JSON com a lista de eventos
+                              replay_data LONGBLOB NOT NULL, -- binário (replay_codec); replays antigos em JSON
                               created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
                               CONSTRAINT fk_replay_game FOREIGN KEY (game_id)
                                   REFERENCES games(id)
@@ -68,6 +71,20 @@ CREATE TABLE game_replays (
 ) ENGINE=InnoDB;
 
 CREATE INDEX idx_replay_game ON game_replays(game_id);
+-- bancos já existentes: ALTER TABLE game_replays MODIFY replay_data LONGBLOB NOT NULL;
+
+-- 4b) Replays enviados em pedaços durante a partida (mesmo formato binário)
+CREATE TABLE game_replay_chunks (
+                                    id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+                                    game_id BIGINT UNSIGNED NOT NULL,
+                                    seq INT NOT NULL,
+                                    chunk_data LONGBLOB NOT NULL,
+                                    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                                    UNIQUE KEY uq_replay_chunk (game_id, seq),
+                                    CONSTRAINT fk_replay_chunk_game FOREIGN KEY (game_id)
+                                        REFERENCES games(id)
+                                        ON DELETE CASCADE
+) ENGINE=InnoDB;
 
 -- 5) High scores
 CREATE TABLE user_high_scores (
@@ -78,3 +95,38 @@ CREATE TABLE user_high_scores (
                                       REFERENCES users(id)
                                       ON DELETE CASCADE
 ) ENGINE=InnoDB;
+
+-- 6) Ranking materializado (atualizado por finish_game a cada partida concluída)
+--    period: 'all' (period_start = 1970-01-01), 'day' (o dia) ou 'week' (a segunda-feira)
+--    cada janela guarda só o top LEADERBOARD_SIZE (repository.py)
+CREATE TABLE leaderboard (
+                             id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+                             period ENUM('all','day','week') NOT NULL,
+                             period_start DATE NOT NULL,
+                             game_id BIGINT UNSIGNED NOT NULL,
+                             user_id BIGINT UNSIGNED NOT NULL,
+                             username VARCHAR(50) NOT NULL, -- copiado de users: o top N sai sem JOIN
+                             final_score INT NOT NULL,
+                             lines_cleared INT NOT NULL,
+                             level_reached INT NOT NULL,
+                             finished_at DATETIME(6) NOT NULL,
+                             UNIQUE KEY uq_leaderboard_game (period, period_start, game_id),
+                             CONSTRAINT fk_leaderboard_game FOREIGN KEY (game_id)
+                                 REFERENCES games(id)
+                                 ON DELETE CASCADE
+) ENGINE=InnoDB;
+
+-- índice de cobertura: mesma ordem do ORDER BY e todas as colunas do SELECT,
+-- o top N é lido direto do índice (sem filesort e sem ir na tabela)
+CREATE INDEX idx_leaderboard_top
+    ON leaderboard(period, period_start, final_score DESC, finished_at ASC,
+                   user_id, username, lines_cleared, level_reached);
+-- bancos já existentes (preenche o ranking geral; dia/semana enchem com as próximas partidas):
+--   INSERT INTO leaderboard (period, period_start, game_id, user_id, username,
+--                            final_score, lines_cleared, level_reached, finished_at)
+--   SELECT 'all', '1970-01-01', g.id, g.user_id, u.username,
+--          g.final_score, g.lines_cleared, g.level_reached, g.finished_at
+--   FROM games g JOIN users u ON u.id = g.user_id
+--   WHERE g.status = 'completed'
+--   ORDER BY g.final_score DESC, g.finished_at ASC
+--   LIMIT 100;
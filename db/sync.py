@@ -0,0 +1,117 @@
+# db/sync.py
+"""
+Envia a outbox do armazenamento local (db/local_store.py) para o MySQL.
+
+Uma thread em segundo plano pega as operações pendentes em lotes, na ordem em
+que foram gravadas, e aplica cada lote numa transação só
+(`repository.apply_local_writes`). As ops de uma partida criada offline
+trazem o id local; o sync passa junto o mapa id local -> id no servidor
+(`games.server_id` no SQLite) e guarda os ids das partidas criadas no lote.
+Se o lote falhar, a primeira operação é
+tentada sozinha para achar a que está quebrando (depois de MAX_ATTEMPTS ela
+é deixada de lado); com o banco fora do ar só o intervalo entre tentativas
+aumenta, dobrando até `max_backoff`.
+"""
+import threading
+import time
+
+from . import db, repository, local_store
+
+
+class OutboxSync:
+    def __init__(self, store: local_store.LocalStore, interval: float = 2.0,
+                 batch_size: int = 64, max_backoff: float = 60.0):
+        self.store = store
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        self._delay = interval
+        self._wake = threading.Event()
+        self._stop = False
+        self._lock = threading.Lock()  # um lote por vez (thread ou flush)
+        self._thread: threading.Thread | None = None
+        self._created: dict = {}
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="db-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop = True
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop:
+            self._wake.wait(self._delay)
+            self._wake.clear()
+            if not self._stop:
+                self.sync_once()
+
+    def sync_once(self) -> int:
+        """Envia um lote. Retorna quantas operações foram para o banco (-1 = falhou)."""
+        if not db.is_configured():
+            return 0
+        with self._lock:
+            ops = self.store.pending(self.batch_size)
+            if not ops:
+                self._delay = self.interval
+                return 0
+            if self._apply(ops):
+                self.store.remove([op["id"] for op in ops], self._created)
+                # lote cheio: provavelmente tem mais, então não espera
+                self._delay = 0 if len(ops) == self.batch_size else self.interval
+                return len(ops)
+
+            # banco fora do ar não é culpa da operação: só espera mais
+            if db.ping():
+                first = ops[0]
+                if len(ops) > 1 and self._apply([first]):
+                    self.store.remove([first["id"]], self._created)
+                    return 1
+                self.store.mark_failed(first["id"])
+            self._delay = min(max(self._delay, self.interval) * 2, self.max_backoff)
+            return -1
+
+    def _apply(self, ops: list[dict]) -> bool:
+        """Aplica as ops com os ids de servidor já conhecidos; `_created` fica com os novos."""
+        local_ids = [op["game_id"] for op in ops
+                     if op["game_id"] is not None and op["meta"].get("local_game")]
+        game_ids = self.store.server_ids(local_ids)
+        known = set(game_ids)
+        ok = repository.apply_local_writes(ops, game_ids)
+        self._created = {k: v for k, v in game_ids.items() if k not in known}
+        return ok
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Tenta esvaziar a outbox agora. Retorna False se sobrou algo."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            sent = self.sync_once()
+            if sent == 0:
+                return self.store.pending_count() == 0
+            if sent < 0 or (deadline is not None and time.monotonic() >= deadline):
+                return False
+
+
+_sync: OutboxSync | None = None
+_sync_lock = threading.Lock()
+
+
+def get_sync() -> OutboxSync:
+    global _sync
+    with _sync_lock:
+        if _sync is None:
+            _sync = OutboxSync(local_store.get_store())
+        return _sync
+
+
+def start() -> None:
+    """Liga a sincronização (o que ficou pendente da última execução vai junto)."""
+    get_sync().start()
+
+
+def flush(timeout: float | None = None) -> bool:
+    if _sync is None:
+        return True
+    return _sync.flush(timeout)
@@ -1,12 +1,66 @@
+import os
+import time
 import arcade
 from tetris.view.gui import LoginView
 from tetris.core.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+from tetris.core.lazy import warm_up
+from db import persistence
+
+# bench_startup.py passa o instante (time.time) em que lançou o processo
+_BENCH_T0 = os.getenv("TETRIS_BENCH_STARTUP")
+
+
+def _start_db_sync():
+    # roda na thread de aquecimento, depois dos imports pesados
+    from db import sync
+    # o que ficou na outbox local da última vez sobe junto
+    sync.start()
+
+
+def _report_first_frame(window, view, marks):
+    """
+    Modo benchmark: mede até o primeiro quadro desenhado e fecha a janela.
+    Precisa ser chamado antes do show_view (o arcade guarda o on_draw da view ali).
+    """
+    draw = view.on_draw
+    first = [True]
+
+    def on_draw_once():
+        draw()
+        if first[0]:
+            first[0] = False
+            # roda no próximo tick, depois do flip do primeiro quadro
+            arcade.schedule_once(_done, 0)
+
+    def _done(_dt):
+        t0 = float(_BENCH_T0)
+        parts = " ".join(f"{k}={(v - t0) * 1000:.0f}" for k, v in marks.items())
+        print(f"[STARTUP] {parts} first_frame={(time.time() - t0) * 1000:.0f} ms")
+        window.close()
+
+    view.on_draw = on_draw_once
+
 
 def main():
+    marks = {"imports": time.time()}
     window = arcade.Window(WINDOW_WIDTH, WINDOW_HEIGHT, "Tetris retrô")
+    marks["window"] = time.time()
     view = LoginView()
+    if _BENCH_T0:
+        _report_first_frame(window, view, marks)
     window.show_view(view)
+    # banco, SQLAlchemy e bcrypt carregam enquanto o login já está na tela
+    warm_up("db.repository", "db.local_store", "db.sync", then=_start_db_sync)
     arcade.run()
+    # escritas ainda na fila vão pro armazenamento local e, se der, pro banco;
+    # o que não subir agora fica na outbox para a próxima execução
+    persistence.flush(timeout=10.0)
+    from db import sync
+    sync.flush(timeout=5.0)
+    # DB_METRICS=1: imprime as métricas do banco ao sair
+    if os.getenv("DB_METRICS"):
+        from db import metrics
+        metrics.dump()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,54 @@
+import random
+
+import numpy as np
+
+from tetris.core.constants import BOARD_WIDTH, BOARD_HEIGHT, TICK_DT
+from tetris.models.batch import BatchTetrisGame, NOOP, LEFT, RIGHT, SOFT_DROP, ROTATE, HARD_DROP
+from tetris.models.game import TetrisGame
+
+ACTIONS = {
+    LEFT: TetrisGame.move_left,
+    RIGHT: TetrisGame.move_right,
+    SOFT_DROP: TetrisGame.soft_drop,
+    ROTATE: TetrisGame.rotate,
+    HARD_DROP: TetrisGame.hard_drop,
+}
+
+
+def test_batch_matches_tetris_game():
+    """Mesmas seeds e entradas: tabuleiro, placar e game over iguais a cada passo."""
+    seeds = list(range(24))
+    batch = BatchTetrisGame(seeds)
+    games = [TetrisGame(rng_seed=s) for s in seeds]
+    rng = random.Random(1234)
+    # linhas de baixo quase cheias (um buraco cada), iguais nos dois lados,
+    # para as partidas limparem linhas e subirem de nível
+    for i, game in enumerate(games):
+        cells = bytearray(BOARD_WIDTH * BOARD_HEIGHT)
+        for r in range(BOARD_HEIGHT - 12, BOARD_HEIGHT):
+            hole = rng.randrange(BOARD_WIDTH)
+            for c in range(BOARD_WIDTH):
+                if c != hole:
+                    cells[r * BOARD_WIDTH + c] = rng.randrange(1, 8)
+        game.board.load_cells(cells)
+        batch.boards[i] = np.frombuffer(bytes(cells), dtype=np.uint8).reshape(BOARD_HEIGHT, BOARD_WIDTH)
+    # pesos: quase sempre nada, às vezes um hard drop para a partida andar
+    choices = [NOOP] * 12 + [LEFT, RIGHT, SOFT_DROP, ROTATE, ROTATE, HARD_DROP]
+
+    for _ in range(6000):
+        actions = np.array([rng.choice(choices) for _ in games])
+        delta = rng.choice((TICK_DT, TICK_DT, 0.1, 0.5))
+        batch.step(actions, delta)
+        for game, action in zip(games, actions):
+            if action != NOOP:
+                ACTIONS[action](game)
+            game.tick(delta)
+        for i, game in enumerate(games):
+            assert bytes(batch.boards[i]) == bytes(game.board.cells), i
+            assert (batch.score[i], batch.lines[i], batch.level[i]) == (game.score, game.lines, game.level), i
+            assert bool(batch.game_over[i]) == game.game_over, i
+        if all(g.game_over for g in games):
+            break
+
+    # o teste só vale se as partidas chegaram a limpar linhas
+    assert batch.lines.sum() > 0
@@ -0,0 +1,53 @@
+import random
+
+from tetris.core import replay, state_codec
+from tetris.models.game import TetrisGame
+from verify_replays import audit_replay
+
+
+def _play(game: TetrisGame, seed: int, max_ticks: int = 20_000) -> list[dict]:
+    """Joga com teclas aleatórias gravando como o PlayfieldView; devolve os pedaços."""
+    rng = random.Random(seed)
+    recorder = replay.ReplayRecorder()
+    recorder.start(game)
+    chunks = []
+    while not game.game_over and game.tick_count < max_ticks:
+        if rng.random() < 0.2:
+            key = rng.choice(replay.REPLAY_KEYS)
+            recorder.record_key(game, key)
+            replay.apply_key(game, key)
+        game.step()
+        recorder.after_step(game)
+        if recorder.chunk_ready():
+            chunks.append(recorder.take_chunk())
+    chunks.append(recorder.take_chunk())
+    return chunks
+
+
+def test_honest_game_is_ok():
+    game = TetrisGame(rng_seed=7)
+    chunks = _play(game, 7)
+    res = audit_replay(7, (game.score, game.lines, game.level), chunks)
+    assert res["status"] == "ok"
+
+
+def test_forged_start_keyframe_is_rejected():
+    """Keyframe inicial com placar inflado: a simulação parte da seed e acusa."""
+    forged = TetrisGame(rng_seed=7)
+    forged.score = 500_000
+    forged.lines = 90
+    forged.level = 10
+    chunks = _play(forged, 7)
+    res = audit_replay(7, (forged.score, forged.lines, forged.level), chunks)
+    assert res["status"] == "mismatch"
+    assert res["reason"] == "keyframe inicial não bate com a seed"
+
+
+def test_resumed_game_is_unverifiable():
+    game = TetrisGame(rng_seed=3)
+    for _ in range(500):
+        game.step()
+    game = state_codec.keyframe_to_game(state_codec.game_to_keyframe(game))
+    chunks = _play(game, 3)
+    res = audit_replay(None, (game.score, game.lines, game.level), chunks)
+    assert res["status"] == "unverifiable"
@@ -10,3 +10,7 @@ WINDOW_HEIGHT = BOARD_HEIGHT * CELL_SIZE
 BASE_FALL_INTERVAL = 0.8  # seconds at level 1
 MAX_LEVEL_SPEED_MULTIPLIER = 2.0  # level 10 is 2x speed (half interval)
 LINES_PER_LEVEL = 10
+
+# tick lógico fixo: o jogo avança sempre em passos iguais (replays exatos)
+TICK_RATE = 60  # ticks por segundo
+TICK_DT = 1.0 / TICK_RATE
@@ -0,0 +1,59 @@
+# tetris/core/lazy.py
+"""
+Import preguiçoso para o caminho rápido de inicialização.
+
+O banco (SQLAlchemy, bcrypt, dotenv) custa centenas de ms para importar e a
+tela de login não precisa dele para aparecer. `lazy_import` devolve um
+substituto do módulo que só importa de verdade no primeiro acesso a um
+atributo, e `warm_up` faz esse import numa thread enquanto a janela já está
+na tela.
+"""
+import importlib
+import threading
+
+
+class LazyModule:
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            # import_module já é seguro entre threads (lock por módulo)
+            module = self._module = importlib.import_module(self._name)
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "carregado" if self._module is not None else "pendente"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def warm_up(*names: str, then=None) -> threading.Thread:
+    """
+    Importa os módulos numa thread em segundo plano e depois chama `then()`
+    (também nessa thread). Quem usar o módulo antes espera só o que faltar.
+    """
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"[STARTUP] import de {name} falhou:", e)
+        if then is not None:
+            then()
+
+    t = threading.Thread(target=run, name="warm-up", daemon=True)
+    t.start()
+    return t
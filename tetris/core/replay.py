@@ -0,0 +1,246 @@
+# tetris/core/replay.py
+from __future__ import annotations
+
+import math
+from array import array
+
+from tetris.models.game import TetrisGame
+from tetris.core.constants import TICK_RATE
+from tetris.core import state_codec
+
+# códigos de tecla gravados no replay (mesmos valores de arcade.key / pyglet),
+# repetidos aqui para simular sem importar o arcade
+KEY_LEFT = 0xff51
+KEY_UP = 0xff52
+KEY_RIGHT = 0xff53
+KEY_DOWN = 0xff54
+KEY_SPACE = 0x20
+KEY_W = 0x77
+KEY_X = 0x78
+
+REPLAY_KEYS = (KEY_LEFT, KEY_RIGHT, KEY_DOWN, KEY_UP, KEY_X, KEY_W, KEY_SPACE)
+
+# a cada quantas peças travadas o replay guarda um keyframe
+KEYFRAME_INTERVAL = 25
+
+# máximo de eventos pendentes antes de mandar um pedaço do replay pro banco
+CHUNK_MAX_EVENTS = 512
+
+# limite de segurança para replays corrompidos que nunca chegam ao game over
+MAX_TICKS = TICK_RATE * 60 * 60 * 4
+
+
+def apply_key(game: TetrisGame, key: int | None) -> None:
+    """Aplica no jogo a ação correspondente a uma tecla gravada."""
+    if key == KEY_LEFT:
+        game.move_left()
+    elif key == KEY_RIGHT:
+        game.move_right()
+    elif key == KEY_DOWN:
+        game.soft_drop()
+    elif key in (KEY_UP, KEY_X, KEY_W):
+        game.rotate()
+    elif key == KEY_SPACE:
+        game.hard_drop()
+
+
+def normalize_events(events: list[dict]) -> list[dict]:
+    """
+    Garante eventos no formato {"tick": int, "key": int}.
+    Replays antigos guardavam o tempo em segundos ("t"); eles são convertidos
+    para o tick em que o ReplayView antigo os aplicaria.
+    """
+    out = []
+    for ev in events:
+        if "tick" in ev:
+            out.append(ev)
+        else:
+            tick = max(0, math.ceil(ev["t"] * TICK_RATE) - 1)
+            out.append({"tick": tick, "key": ev.get("key")})
+    return out
+
+
+def make_keyframe(game: TetrisGame, event_index: int) -> dict:
+    """
+    Foto do jogo numa fronteira de tick: estado completo (com RNG) e
+    quantos eventos já tinham sido aplicados.
+    """
+    return {
+        "tick": game.tick_count,
+        "event_index": event_index,
+        "state": state_codec.game_to_keyframe(game),
+    }
+
+
+class ReplayRecorder:
+    """
+    Grava as entradas da partida e, a cada KEYFRAME_INTERVAL peças
+    travadas, um keyframe para o replay poder pular direto para ali.
+    Os eventos ficam em dois arrays (tick, tecla) em vez de um dict por evento.
+    Com take_chunk() o que já foi gravado sai da memória em pedaços, para
+    ser enviado ao banco durante a partida.
+    """
+
+    def __init__(self, keyframe_interval: int = KEYFRAME_INTERVAL,
+                 chunk_max_events: int = CHUNK_MAX_EVENTS):
+        self.ticks = array("I")
+        self.keys = array("I")
+        self.keyframes: list[dict] = []
+        self.keyframe_interval = keyframe_interval
+        self.chunk_max_events = chunk_max_events
+        self._next_keyframe = keyframe_interval
+        # eventos já entregues em pedaços anteriores
+        self._flushed_events = 0
+
+    @property
+    def event_count(self) -> int:
+        return self._flushed_events + len(self.ticks)
+
+    def start(self, game: TetrisGame) -> None:
+        """
+        Keyframe inicial (event_index 0): o ReplayView passa a começar do
+        estado em que a partida estava, e não da seed. É o que torna
+        assistível uma partida retomada de um save. A auditoria não confia
+        nele: só o compara com o jogo novo da seed.
+        """
+        self.keyframes.append(make_keyframe(game, self.event_count))
+
+    def record_key(self, game: TetrisGame, key: int) -> None:
+        self.ticks.append(game.tick_count)
+        self.keys.append(key)
+
+    def after_step(self, game: TetrisGame) -> None:
+        # chamado depois de cada game.step(): só aqui o tick está fechado
+        if game.game_over or game.pieces_locked < self._next_keyframe:
+            return
+        self.keyframes.append(make_keyframe(game, self.event_count))
+        self._next_keyframe = game.pieces_locked + self.keyframe_interval
+
+    def chunk_ready(self) -> bool:
+        """Há um pedaço que vale enviar: muitos eventos ou um keyframe novo."""
+        return len(self.ticks) >= self.chunk_max_events or bool(self.keyframes)
+
+    def take_chunk(self) -> dict:
+        """Entrega o que está pendente e libera a memória."""
+        chunk = self.to_replay()
+        self._flushed_events += len(self.ticks)
+        self.ticks = array("I")
+        self.keys = array("I")
+        self.keyframes = []
+        return chunk
+
+    def to_replay(self) -> dict:
+        return {"ticks": self.ticks, "keys": self.keys, "keyframes": self.keyframes}
+
+
+def has_start_keyframe(replay: dict) -> bool:
+    """
+    O primeiro keyframe vem antes de qualquer evento: dá para reproduzir a
+    partida a partir dele sem depender da seed.
+    """
+    keyframes = replay.get("keyframes") or []
+    return bool(keyframes) and min(keyframes, key=lambda k: k["tick"])["event_index"] == 0
+
+
+class ReplayRunner:
+    """
+    Reproduz um replay tick a tick sobre um TetrisGame.
+    Como tudo é contado em ticks lógicos, dá para rodar em qualquer
+    velocidade (1x, 16x, o máximo da CPU) sem perder sincronia.
+    Com keyframes, seek() pula para qualquer tick simulando só o trecho
+    desde o keyframe anterior.
+    Se o replay tem keyframe inicial (event_index 0), a reprodução começa
+    dele e `game` (o jogo novo da seed) é descartado. Isso serve para
+    exibir (partidas retomadas de um save); a auditoria nunca parte de um
+    keyframe, que é escrito pelo cliente: simulate_replay* usam só a seed.
+    """
+
+    def __init__(self, game: TetrisGame, replay: dict):
+        self.ticks = replay["ticks"]
+        self.keys = replay["keys"]
+        self.index = 0
+        keyframes = sorted(replay.get("keyframes") or [], key=lambda k: k["tick"])
+        if has_start_keyframe(replay):
+            game = state_codec.keyframe_to_game(keyframes[0]["state"])
+        else:
+            # o início da partida vale como keyframe zero
+            keyframes = [make_keyframe(game, 0)] + keyframes
+        self.game = game
+        self.keyframes = keyframes
+
+    @property
+    def finished(self) -> bool:
+        return self.game.game_over
+
+    def step(self) -> None:
+        # entradas gravadas neste tick entram antes da gravidade do tick
+        tick = self.game.tick_count
+        ticks = self.ticks
+        while self.index < len(ticks) and ticks[self.index] <= tick:
+            apply_key(self.game, self.keys[self.index])
+            self.index += 1
+        self.game.step()
+
+    def seek(self, tick: int) -> None:
+        """
+        Leva o replay até o tick pedido (ou até o game over, se vier antes).
+        Para voltar no tempo ou pular para frente, restaura o keyframe
+        mais próximo antes do alvo.
+        """
+        tick = max(0, tick)
+        best = self.keyframes[0]
+        for kf in self.keyframes:
+            if kf["tick"] <= tick:
+                best = kf
+            else:
+                break
+        if tick < self.game.tick_count or best["tick"] > self.game.tick_count:
+            self.game = state_codec.keyframe_to_game(best["state"])
+            self.index = best["event_index"]
+        self.advance(tick - self.game.tick_count)
+
+    def seek_end(self) -> None:
+        """Vai direto para o fim da partida a partir do último keyframe."""
+        self.seek(self.keyframes[-1]["tick"])
+        self.advance(MAX_TICKS)
+
+    def advance(self, ticks: int) -> int:
+        """Avança até `ticks` ticks; retorna quantos rodou de fato."""
+        done = 0
+        while done < ticks and not self.finished:
+            self.step()
+            done += 1
+        return done
+
+
+def simulate_replay(rng_seed: int | None, replay: dict,
+                    max_ticks: int = MAX_TICKS) -> TetrisGame:
+    """
+    Reproduz um replay sem janela, na velocidade da CPU, até o game over.
+    Sempre a partir da seed: os keyframes do replay são ignorados.
+    """
+    runner = ReplayRunner(TetrisGame(rng_seed=rng_seed), dict(replay, keyframes=[]))
+    runner.advance(max_ticks)
+    return runner.game
+
+
+def simulate_replay_chunks(rng_seed: int | None, chunks,
+                           max_ticks: int = MAX_TICKS) -> TetrisGame:
+    """
+    Como simulate_replay, mas consome os pedaços do replay um a um (ex.: o
+    cursor do banco), sem juntar todos na memória. Também parte sempre da
+    seed; keyframes não são necessários para ir do início ao fim.
+    """
+    game = TetrisGame(rng_seed=rng_seed)
+    end = max_ticks
+    for chunk in chunks:
+        for tick, key in zip(chunk["ticks"], chunk["keys"]):
+            # mesma ordem do ReplayRunner: entradas do tick antes da gravidade
+            while game.tick_count < tick and not game.game_over and game.tick_count < end:
+                game.step()
+            if game.game_over or game.tick_count >= end:
+                return game
+            apply_key(game, key)
+    while not game.game_over and game.tick_count < end:
+        game.step()
+    return game
@@ -0,0 +1,181 @@
+# tetris/core/replay_codec.py
+"""
+Formato binário compacto de replay.
+
+    cabeçalho: b"TRPL" | versão (1 byte) | compressão (1 byte)
+    corpo (opcionalmente zlib/lzma):
+        varint n_eventos
+        n x (varint delta_de_tick, 1 byte índice da tecla em KEY_CODES)
+        varint n_keyframes
+        n x (varint tick, varint event_index, varint tamanho, estado)
+
+O estado do keyframe é o save binário do save_codec (versão 2);
+na versão 1 era o estado em JSON.
+
+Replays antigos em JSON (lista de eventos ou {"events", "keyframes"})
+continuam sendo lidos por decode_replay.
+"""
+from __future__ import annotations
+
+import json
+import zlib
+from array import array
+
+from tetris.core import save_codec, state_codec
+from tetris.core.replay import REPLAY_KEYS, normalize_events
+
+MAGIC = b"TRPL"
+VERSION = 2
+
+COMPRESS_NONE = 0
+COMPRESS_ZLIB = 1
+COMPRESS_LZMA = 2
+_COMPRESSION = {"none": COMPRESS_NONE, "zlib": COMPRESS_ZLIB, "lzma": COMPRESS_LZMA}
+
+# enum das teclas: no arquivo cada evento guarda só o índice (1 byte)
+KEY_CODES = REPLAY_KEYS
+_KEY_INDEX = {code: i for i, code in enumerate(KEY_CODES)}
+
+
+def empty_replay() -> dict:
+    return {"ticks": array("I"), "keys": array("I"), "keyframes": []}
+
+
+def replay_from_events(events: list[dict], keyframes: list[dict] | None = None) -> dict:
+    """
+    Converte a lista antiga de dicts de evento para o formato em arrays.
+    Eventos gravados em segundos ("t") só viram ticks de forma aproximada:
+    o replay sai marcado com "legacy".
+    """
+    replay = empty_replay()
+    if any("tick" not in ev for ev in events):
+        replay["legacy"] = True
+    for ev in normalize_events(events):
+        replay["ticks"].append(ev["tick"])
+        replay["keys"].append(ev["key"])
+    replay["keyframes"] = list(keyframes or [])
+    return replay
+
+
+def concat_replays(chunks) -> dict:
+    """Junta pedaços de replay (na ordem) em um único replay."""
+    replay = empty_replay()
+    for chunk in chunks:
+        replay["ticks"].extend(chunk["ticks"])
+        replay["keys"].extend(chunk["keys"])
+        replay["keyframes"].extend(chunk.get("keyframes") or [])
+        if chunk.get("legacy"):
+            replay["legacy"] = True
+    return replay
+
+
+# ---------- varint (LEB128 sem sinal) ----------
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+# ---------- codec ----------
+
+def encode_replay(replay: dict, compression: str = "zlib") -> bytes:
+    body = bytearray()
+    ticks = replay["ticks"]
+    keys = replay["keys"]
+
+    _write_varint(body, len(ticks))
+    last = 0
+    for tick, key in zip(ticks, keys):
+        if tick < last:
+            raise ValueError("eventos de replay fora de ordem")
+        _write_varint(body, tick - last)
+        body.append(_KEY_INDEX[key])
+        last = tick
+
+    keyframes = replay.get("keyframes") or []
+    _write_varint(body, len(keyframes))
+    for kf in keyframes:
+        state = kf["state"]
+        if not save_codec.is_binary_save(state):
+            state = state_codec.game_to_keyframe(state_codec.keyframe_to_game(state))
+        _write_varint(body, kf["tick"])
+        _write_varint(body, kf["event_index"])
+        _write_varint(body, len(state))
+        body += state
+
+    mode = _COMPRESSION[compression]
+    if mode == COMPRESS_ZLIB:
+        payload = zlib.compress(bytes(body), 6)
+    elif mode == COMPRESS_LZMA:
+        import lzma  # raro: só importa quando usado
+        payload = lzma.compress(bytes(body))
+    else:
+        payload = bytes(body)
+    return MAGIC + bytes((VERSION, mode)) + payload
+
+
+def is_binary_replay(data) -> bool:
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:4]) == MAGIC
+
+
+def decode_replay(data) -> dict:
+    """
+    Lê um replay salvo: binário novo ou JSON antigo (str ou bytes).
+    Sempre retorna {"ticks": array, "keys": array, "keyframes": list}.
+    """
+    if not is_binary_replay(data):
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data).decode("utf-8")
+        legacy = json.loads(data)
+        if isinstance(legacy, list):
+            return replay_from_events(legacy)
+        return replay_from_events(legacy["events"], legacy.get("keyframes"))
+
+    data = bytes(data)
+    version, mode = data[4], data[5]
+    if version not in (1, VERSION):
+        raise ValueError(f"versão de replay desconhecida: {version}")
+    body = data[6:]
+    if mode == COMPRESS_ZLIB:
+        body = zlib.decompress(body)
+    elif mode == COMPRESS_LZMA:
+        import lzma
+        body = lzma.decompress(body)
+
+    replay = empty_replay()
+    ticks = replay["ticks"]
+    keys = replay["keys"]
+    count, pos = _read_varint(body, 0)
+    tick = 0
+    for _ in range(count):
+        delta, pos = _read_varint(body, pos)
+        tick += delta
+        ticks.append(tick)
+        keys.append(KEY_CODES[body[pos]])
+        pos += 1
+
+    n_keyframes, pos = _read_varint(body, pos)
+    for _ in range(n_keyframes):
+        kf_tick, pos = _read_varint(body, pos)
+        event_index, pos = _read_varint(body, pos)
+        size, pos = _read_varint(body, pos)
+        state = body[pos:pos + size]
+        if version == 1:
+            state = json.loads(state.decode("utf-8"))
+        pos += size
+        replay["keyframes"].append({"tick": kf_tick, "event_index": event_index, "state": state})
+    return replay
@@ -0,0 +1,246 @@
+# tetris/core/save_codec.py
+"""
+Save-state binário e versionado do TetrisGame.
+
+    b"TS" | versão u8 | flags u8 | largura u8 | altura u8 | primeira linha ocupada u8
+    células da primeira linha ocupada até o fundo, 4 bits cada (0 = vazio, 1..7 = peça)
+    peça atual e próxima: (kind, rotação, x, y) como 4 x i8 (kind -1 = sem peça)
+    score u32 | linhas u32 | nível u16 | ticks u32 | peças travadas u32 | fall_acc f64
+    RNG: seed i64 + peças sorteadas u32   ou (flag RNG_FULL) o estado inteiro do Mersenne Twister
+
+Com a seed, um save tem até ~150 bytes: o tabuleiro ocupa até 100 (200 células
+de 4 bits; só as linhas ocupadas entram) e o resto é cabeçalho, peças, contadores
+e RNG. Em troca, decodificar refaz as `draws` chamadas do RNG da seed, então custa
+O(peças sorteadas). `game_to_record` / `record_to_game` dão a mesma informação em
+dict, usado no JSON de depuração.
+"""
+from __future__ import annotations
+
+import json
+import random
+import struct
+
+from tetris.models.game import TetrisGame
+from tetris.models.board import Board
+from tetris.models.pieces import PIECE_KINDS
+from tetris.models.tetromino import Tetromino
+
+MAGIC = b"TS"
+VERSION = 1
+
+FLAG_PAUSED = 1
+FLAG_GAME_OVER = 2
+FLAG_RNG_FULL = 4
+
+_HEADER = struct.Struct("<2sBBBBB")
+_PIECE = struct.Struct("<bbbb")
+_COUNTERS = struct.Struct("<IIHIId")
+_RNG_SEEDED = struct.Struct("<qI")
+_RNG_FULL = struct.Struct("<625IBd")
+
+# ids de célula (0..15) <-> dígitos hex, um caractere por célula
+_TO_HEX = bytes.maketrans(bytes(range(16)), b"0123456789abcdef")
+_FROM_HEX = bytes.maketrans(b"0123456789abcdef", bytes(range(16)))
+
+
+# ---------- peças ----------
+
+def _piece_to_tuple(p: Tetromino | None):
+    if p is None:
+        return None
+    return [p.piece_id - 1, p.rotation, p.x, p.y]
+
+
+def _tuple_to_piece(t):
+    if t is None:
+        return None
+    kind, rotation, x, y = t
+    p = Tetromino.from_kind(PIECE_KINDS[kind], rotation)
+    p.x = x
+    p.y = y
+    return p
+
+
+# ---------- dict compacto ----------
+
+def game_to_record(game: TetrisGame) -> dict:
+    rng: dict
+    seed = game.rng_seed
+    if seed is not None and -(1 << 63) <= seed < (1 << 63):
+        rng = {"seed": seed, "draws": game.pieces_drawn}
+    else:
+        version, internal, gauss_next = game._rng.getstate()
+        rng = {"state": list(internal), "gauss_next": gauss_next}
+
+    board = game.board
+    w = board.width
+    digits = board.cells.translate(_TO_HEX).decode("ascii")
+    return {
+        "v": VERSION,
+        "width": w,
+        "height": board.height,
+        # uma string hex por linha, um dígito (id da peça) por célula
+        "cells": [digits[r * w:(r + 1) * w] for r in range(board.height)],
+        "current": _piece_to_tuple(game.current),
+        "next": _piece_to_tuple(game.next_piece),
+        "score": game.score,
+        "lines": game.lines,
+        "level": game.level,
+        "tick_count": game.tick_count,
+        "pieces_locked": game.pieces_locked,
+        "fall_acc": game._fall_acc,
+        "paused": game.paused,
+        "game_over": game.game_over,
+        "rng": rng,
+    }
+
+
+def record_to_game(rec: dict) -> TetrisGame:
+    if rec.get("v") != VERSION:
+        raise ValueError(f"versão de save desconhecida: {rec.get('v')}")
+
+    rng = rec["rng"]
+    if "seed" in rng:
+        g = TetrisGame(rng_seed=rng["seed"])
+        # refaz os sorteios para deixar o RNG no mesmo ponto
+        r = random.Random(rng["seed"])
+        for _ in range(rng["draws"]):
+            r.choice(PIECE_KINDS)
+        g._rng = r
+        g.pieces_drawn = rng["draws"]
+    else:
+        g = TetrisGame()
+        g._rng.setstate((3, tuple(rng["state"]), rng["gauss_next"]))
+
+    g.board = Board(rec["width"], rec["height"])
+    g.board.load_cells("".join(rec["cells"]).encode("ascii").translate(_FROM_HEX))
+    g.current = _tuple_to_piece(rec["current"])
+    g.next_piece = _tuple_to_piece(rec["next"])
+    g.score = rec["score"]
+    g.lines = rec["lines"]
+    g.level = rec["level"]
+    g.tick_count = rec["tick_count"]
+    g.pieces_locked = rec["pieces_locked"]
+    g._fall_acc = rec["fall_acc"]
+    g.paused = rec["paused"]
+    g.game_over = rec["game_over"]
+    return g
+
+
+# ---------- binário ----------
+
+def _pack_piece(t) -> bytes:
+    if t is None:
+        return _PIECE.pack(-1, 0, 0, 0)
+    return _PIECE.pack(*t)
+
+
+def _unpack_piece(data, pos):
+    kind, rotation, x, y = _PIECE.unpack_from(data, pos)
+    if kind == -1:
+        return None
+    return [kind, rotation, x, y]
+
+
+def pack_record(rec: dict) -> bytes:
+    cells = rec["cells"]
+    first = next((r for r, row in enumerate(cells) if row.strip("0")), len(cells))
+    digits = "".join(cells[first:])
+    if len(digits) % 2:
+        digits += "0"
+
+    flags = 0
+    if rec["paused"]:
+        flags |= FLAG_PAUSED
+    if rec["game_over"]:
+        flags |= FLAG_GAME_OVER
+    rng = rec["rng"]
+    if "seed" not in rng:
+        flags |= FLAG_RNG_FULL
+
+    out = bytearray(_HEADER.pack(MAGIC, VERSION, flags, rec["width"], rec["height"], first))
+    out += bytes.fromhex(digits)
+    out += _pack_piece(rec["current"])
+    out += _pack_piece(rec["next"])
+    out += _COUNTERS.pack(
+        rec["score"], rec["lines"], rec["level"],
+        rec["tick_count"], rec["pieces_locked"], rec["fall_acc"],
+    )
+    if flags & FLAG_RNG_FULL:
+        gauss = rng["gauss_next"]
+        out += _RNG_FULL.pack(*rng["state"], gauss is not None, gauss or 0.0)
+    else:
+        out += _RNG_SEEDED.pack(rng["seed"], rng["draws"])
+    return bytes(out)
+
+
+def unpack_record(data: bytes) -> dict:
+    magic, version, flags, width, height, first = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("save inválido")
+    if version != VERSION:
+        raise ValueError(f"versão de save desconhecida: {version}")
+    pos = _HEADER.size
+
+    n_cells = (height - first) * width
+    n_bytes = (n_cells + 1) // 2
+    digits = data[pos:pos + n_bytes].hex()[:n_cells]
+    pos += n_bytes
+    cells = ["0" * width] * first + [digits[i:i + width] for i in range(0, n_cells, width)]
+
+    current = _unpack_piece(data, pos)
+    pos += _PIECE.size
+    nxt = _unpack_piece(data, pos)
+    pos += _PIECE.size
+
+    score, lines, level, tick_count, pieces_locked, fall_acc = _COUNTERS.unpack_from(data, pos)
+    pos += _COUNTERS.size
+
+    if flags & FLAG_RNG_FULL:
+        *state, has_gauss, gauss = _RNG_FULL.unpack_from(data, pos)
+        rng = {"state": state, "gauss_next": gauss if has_gauss else None}
+    else:
+        seed, draws = _RNG_SEEDED.unpack_from(data, pos)
+        rng = {"seed": seed, "draws": draws}
+
+    return {
+        "v": version,
+        "width": width,
+        "height": height,
+        "cells": cells,
+        "current": current,
+        "next": nxt,
+        "score": score,
+        "lines": lines,
+        "level": level,
+        "tick_count": tick_count,
+        "pieces_locked": pieces_locked,
+        "fall_acc": fall_acc,
+        "paused": bool(flags & FLAG_PAUSED),
+        "game_over": bool(flags & FLAG_GAME_OVER),
+        "rng": rng,
+    }
+
+
+# ---------- API ----------
+
+def encode_game(game: TetrisGame) -> bytes:
+    return pack_record(game_to_record(game))
+
+
+def encode_game_json(game: TetrisGame) -> str:
+    """Mesmo conteúdo do binário, legível (para depuração)."""
+    return json.dumps(game_to_record(game))
+
+
+def is_binary_save(data) -> bool:
+    return isinstance(data, (bytes, bytearray, memoryview)) and bytes(data[:2]) == MAGIC
+
+
+def decode_game(data) -> TetrisGame:
+    """Aceita o binário ou o JSON de depuração (str ou dict)."""
+    if is_binary_save(data):
+        return record_to_game(unpack_record(bytes(data)))
+    if isinstance(data, (str, bytes, bytearray)):
+        data = json.loads(data)
+    return record_to_game(data)
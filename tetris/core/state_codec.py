@@ -1,7 +1,10 @@
 # tetris/state_codec.py
+import copy
 from tetris.models.game import TetrisGame
 from tetris.models.board import Board
 from tetris.models.tetromino import Tetromino
+from tetris.models.pieces import PIECE_PALETTE, color_to_id, piece_from_shape
+from tetris.core import save_codec
 
 def game_to_state(game: TetrisGame) -> dict:
     def piece_to_dict(p: Tetromino | None):
@@ -14,8 +17,11 @@ def game_to_state(game: TetrisGame) -> dict:
             "y": p.y,
         }
 
+    # formato JSON antigo: o tabuleiro vai com as cores (0 = vazio)
+    board = [[PIECE_PALETTE[v] if v else 0 for v in row] for row in game.board.grid]
+
     return {
-        "board": game.board.grid,
+        "board": board,
         "current": piece_to_dict(game.current),
         "next_piece": piece_to_dict(game.next_piece),
         "score": game.score,
@@ -24,18 +30,25 @@ def game_to_state(game: TetrisGame) -> dict:
         "fall_interval": game.fall_interval(),  # se for método
         "paused": game.paused,
         "game_over": game.game_over,
+        "tick_count": game.tick_count,
+        "fall_acc": game._fall_acc,
+        "pieces_locked": game.pieces_locked,
     }
 
-def state_to_game(state: dict) -> TetrisGame:
+def state_to_game(state) -> TetrisGame:
+    # saves novos vêm no formato binário do save_codec
+    if save_codec.is_binary_save(state):
+        return save_codec.decode_game(state)
+
     g = TetrisGame()
     # board
     g.board = Board(len(state["board"][0]), len(state["board"]))
-    g.board.grid = state["board"]
+    g.board.load_grid([[color_to_id(v) for v in row] for row in state["board"]])
 
     def dict_to_piece(d):
         if d is None:
             return None
-        p = Tetromino(d["shape"], tuple(d["color"]))
+        p = piece_from_shape(d["shape"], d["color"])
         p.x = d["x"]
         p.y = d["y"]
         return p
@@ -48,4 +61,26 @@ def state_to_game(state: dict) -> TetrisGame:
     # se fall_interval for armazenado internamente, ajusta aqui
     g.paused = state["paused"]
     g.game_over = state["game_over"]
+    g.tick_count = state.get("tick_count", 0)
+    g._fall_acc = state.get("fall_acc", 0.0)
+    g.pieces_locked = state.get("pieces_locked", 0)
+    return g
+
+
+def game_to_keyframe(game: TetrisGame) -> bytes:
+    """
+    Estado completo para retomar a simulação exatamente de onde parou,
+    incluindo o RNG das peças (save binário do save_codec).
+    """
+    return save_codec.encode_game(game)
+
+
+def keyframe_to_game(state) -> TetrisGame:
+    if save_codec.is_binary_save(state):
+        return save_codec.decode_game(state)
+
+    # keyframes antigos: estado do save em dict + estado do RNG
+    g = state_to_game(copy.deepcopy(state))
+    version, internal, gauss_next = state["rng_state"]
+    g._rng.setstate((version, tuple(internal), gauss_next))
     return g
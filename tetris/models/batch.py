@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import random
+import numpy as np
+
+from tetris.models.pieces import PIECE_KINDS
+from tetris.models.game import LINE_CLEAR_SCORES, fall_interval_for_level
+from tetris.core.constants import BOARD_WIDTH, BOARD_HEIGHT
+
+# ações aceitas por BatchTetrisGame.step (uma por jogo)
+NOOP, LEFT, RIGHT, SOFT_DROP, ROTATE, HARD_DROP = range(6)
+
+SPAWN_X = BOARD_WIDTH // 2 - 2
+WALL_KICKS = (0, -1, 1, -2, 2)
+
+# (kind, rotação, célula, (linha, coluna)) — toda peça tem 4 células
+_CELLS = np.array(
+    [[state.cells for state in kind.states] for kind in PIECE_KINDS],
+    dtype=np.int64,
+)
+_FALL_INTERVALS = np.array([0.0] + [fall_interval_for_level(lvl) for lvl in range(1, 11)])
+_LINE_SCORES = np.array([LINE_CLEAR_SCORES.get(n, 0) for n in range(BOARD_HEIGHT + 1)], dtype=np.int64)
+_KIND_INDEXES = range(len(PIECE_KINDS))
+
+
+class BatchTetrisGame:
+    """
+    N partidas independentes avançando juntas.
+    Os tabuleiros ficam num array (N, altura, largura) com o índice da peça + 1
+    em cada célula (0 = vazio). As regras são as mesmas de TetrisGame: com as
+    mesmas seeds e entradas, o resultado de cada partida é idêntico.
+    """
+
+    def __init__(self, seeds):
+        n = len(seeds)
+        self.n = n
+        self._rngs = [random.Random(s) if s is not None else random.Random() for s in seeds]
+
+        self.boards = np.zeros((n, BOARD_HEIGHT, BOARD_WIDTH), dtype=np.uint8)
+        self.kind = np.zeros(n, dtype=np.int64)
+        self.next_kind = np.zeros(n, dtype=np.int64)
+        for i, rng in enumerate(self._rngs):
+            self.kind[i] = rng.choice(_KIND_INDEXES)
+            self.next_kind[i] = rng.choice(_KIND_INDEXES)
+        self.rotation = np.zeros(n, dtype=np.int64)
+        self.x = np.full(n, SPAWN_X, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.int64)
+
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.level = np.ones(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+
+        self._fall_acc = np.zeros(n, dtype=np.float64)
+
+    # ----- Colisão -----
+    def _fits(self, idx, rotation, x, y):
+        cells = _CELLS[self.kind[idx], rotation]
+        ys = y[:, None] + cells[..., 0]
+        xs = x[:, None] + cells[..., 1]
+        inside = (ys >= 0) & (ys < BOARD_HEIGHT) & (xs >= 0) & (xs < BOARD_WIDTH)
+        occupied = self.boards[
+            idx[:, None],
+            np.clip(ys, 0, BOARD_HEIGHT - 1),
+            np.clip(xs, 0, BOARD_WIDTH - 1),
+        ]
+        return (inside & (occupied == 0)).all(axis=1)
+
+    # ----- Ciclo de atualização -----
+    def step(self, actions, delta_time: float = 0.0):
+        """
+        Aplica uma ação por jogo e depois avança a gravidade em delta_time.
+        Equivale a chamar a ação e então tick(delta_time) em cada TetrisGame.
+        Retorna quantas linhas cada jogo limpou neste passo.
+        """
+        actions = np.asarray(actions)
+        alive = ~self.game_over
+        cleared = np.zeros(self.n, dtype=np.int64)
+
+        self._shift(np.flatnonzero(alive & (actions == LEFT)), -1)
+        self._shift(np.flatnonzero(alive & (actions == RIGHT)), 1)
+        self._soft_drop(np.flatnonzero(alive & (actions == SOFT_DROP)))
+        self._rotate(np.flatnonzero(alive & (actions == ROTATE)))
+        self._hard_drop(np.flatnonzero(alive & (actions == HARD_DROP)), cleared)
+        self.tick(delta_time, cleared)
+        return cleared
+
+    def tick(self, delta_time: float, cleared=None) -> None:
+        if cleared is None:
+            cleared = np.zeros(self.n, dtype=np.int64)
+        # como em TetrisGame.tick: quem já acabou não anda, e o intervalo
+        # é o do nível no início do tick
+        active = ~self.game_over
+        self._fall_acc[active] += delta_time
+        interval = _FALL_INTERVALS[np.minimum(self.level, 10)]
+        while True:
+            due = np.flatnonzero(active & (self._fall_acc >= interval))
+            if not due.size:
+                return
+            self._fall_acc[due] -= interval[due]
+            ok = self._fits(due, self.rotation[due], self.x[due], self.y[due] + 1)
+            self.y[due[ok]] += 1
+            self._lock(due[~ok], cleared)
+
+    # ----- Entradas -----
+    def _shift(self, idx, dx: int) -> None:
+        if not idx.size:
+            return
+        ok = self._fits(idx, self.rotation[idx], self.x[idx] + dx, self.y[idx])
+        self.x[idx[ok]] += dx
+
+    def _soft_drop(self, idx) -> None:
+        if not idx.size:
+            return
+        moved = idx[self._fits(idx, self.rotation[idx], self.x[idx], self.y[idx] + 1)]
+        self.y[moved] += 1
+        self.score[moved] += 1
+
+    def _rotate(self, idx) -> None:
+        pending = idx
+        for dx in WALL_KICKS:
+            if not pending.size:
+                return
+            nxt = (self.rotation[pending] + 1) % 4
+            ok = self._fits(pending, nxt, self.x[pending] + dx, self.y[pending])
+            done = pending[ok]
+            self.rotation[done] = nxt[ok]
+            self.x[done] += dx
+            pending = pending[~ok]
+
+    def _hard_drop(self, idx, cleared) -> None:
+        if not idx.size:
+            return
+        start_y = self.y[idx].copy()
+        moving = idx
+        while moving.size:
+            moving = moving[self._fits(moving, self.rotation[moving], self.x[moving], self.y[moving] + 1)]
+            self.y[moving] += 1
+        self.score[idx] += 2 * (self.y[idx] - start_y)
+        self._lock(idx, cleared)
+
+    # ----- Travamento, linhas e pontuação -----
+    def _lock(self, idx, cleared) -> None:
+        if not idx.size:
+            return
+        cells = _CELLS[self.kind[idx], self.rotation[idx]]
+        ys = self.y[idx, None] + cells[..., 0]
+        xs = self.x[idx, None] + cells[..., 1]
+        inside = (ys >= 0) & (ys < BOARD_HEIGHT) & (xs >= 0) & (xs < BOARD_WIDTH)
+        rows = np.broadcast_to(idx[:, None], ys.shape)
+        values = np.broadcast_to((self.kind[idx] + 1)[:, None], ys.shape)
+        self.boards[rows[inside], ys[inside], xs[inside]] = values[inside]
+
+        full = (self.boards[idx] != 0).all(axis=2)
+        counts = full.sum(axis=1)
+        hit = counts > 0
+        if hit.any():
+            games = idx[hit]
+            n_clear = counts[hit]
+            # linhas cheias vão para o topo (ordem estável) e são zeradas
+            order = np.argsort(~full[hit], axis=1, kind="stable")
+            boards = np.take_along_axis(self.boards[games], order[:, :, None], axis=1)
+            boards[np.arange(BOARD_HEIGHT)[None, :] < n_clear[:, None]] = 0
+            self.boards[games] = boards
+
+            self.lines[games] += n_clear
+            self.score[games] += _LINE_SCORES[n_clear] * self.level[games]
+            self.level[games] = 1 + self.lines[games] // 10
+            cleared[games] += n_clear
+
+        self._spawn_next(idx)
+
+    def _spawn_next(self, idx) -> None:
+        self.kind[idx] = self.next_kind[idx]
+        for i in idx:
+            self.next_kind[i] = self._rngs[i].choice(_KIND_INDEXES)
+        self.rotation[idx] = 0
+        self.x[idx] = SPAWN_X
+        self.y[idx] = 0
+
+        # Se não couber, é game over (modo clássico)
+        blocked = ~self._fits(idx, self.rotation[idx], self.x[idx], self.y[idx])
+        self.game_over[idx[blocked]] = True
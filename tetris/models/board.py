@@ -1,53 +1,319 @@
-from typing import List
+import copy
+from typing import List, Optional, Tuple
 from dataclasses import dataclass, field
 
+
+def shape_row_masks(shape) -> List[int]:
+    """
+    Converte uma matriz de peça em máscaras de bits por linha
+    (bit c ligado = coluna c ocupada).
+    """
+    masks = []
+    for row in shape:
+        m = 0
+        for c, v in enumerate(row):
+            if v:
+                m |= 1 << c
+        masks.append(m)
+    return masks
+
+
+def row_transitions(mask: int, width: int) -> int:
+    """
+    Trocas cheio/vazio entre células vizinhas de uma linha, com as paredes
+    contando como cheias (linha vazia = 2, linha cheia = 0).
+    """
+    ext = (mask << 1) | 1 | (1 << (width + 1))
+    return bin((ext ^ (ext >> 1)) & ((1 << (width + 1)) - 1)).count("1")
+
+
+@dataclass(frozen=True)
+class BoardFeatures:
+    """Retrato das métricas do tabuleiro (para dicas na tela e bots de jogada)."""
+    aggregate_height: int
+    max_height: int
+    holes: int
+    bumpiness: int
+    wells: Tuple[int, ...]   # profundidade do poço em cada coluna
+    row_transitions: int
+
+    @property
+    def well_sum(self) -> int:
+        return sum(self.wells)
+
+
 @dataclass
 class Board:
+    """
+    Tabuleiro em bitboard: cada linha tem uma máscara inteira de ocupação
+    (rows) ao lado das células (cells), um bytearray linha a linha com o
+    id da peça (0 = vazio). A cor de cada id fica na paleta da view.
+    Colisão vira um AND por linha da peça e linha cheia vira uma comparação.
+
+    `heights` guarda a altura de cada coluna (0 = vazia), atualizada no
+    merge e no clear_lines; com ela a queda de uma peça sai do perfil de
+    baixo da peça, sem testar linha por linha.
+
+    As métricas de análise (altura somada, buracos, bumpiness, poços e
+    transições por linha) também são mantidas a cada merge/clear_lines,
+    mexendo só nas colunas e linhas tocadas; `features()` só as copia.
+    Buraco = célula vazia abaixo do topo da coluna, então os buracos de uma
+    coluna são a altura menos as células cheias dela.
+    """
     width: int
     height: int
-    grid: List[List[int]] = field(init=False)
+    cells: bytearray = field(init=False)
+    rows: List[int] = field(init=False)
+    heights: List[int] = field(init=False)
+    filled: List[int] = field(init=False)
+    wells: List[int] = field(init=False)
 
     def __post_init__(self):
-        self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        self.full_mask = (1 << self.width) - 1
+        self.clear_all()
+
+    @property
+    def grid(self) -> List[List[int]]:
+        """Cópia das células como matriz (linha, coluna) de ids."""
+        w = self.width
+        return [list(self.cells[r * w:(r + 1) * w]) for r in range(self.height)]
+
+    def key(self) -> bytes:
+        """Conteúdo imutável do tabuleiro, barato para hash/comparação."""
+        return bytes(self.cells)
 
     def clear_all(self):
+        self.cells = bytearray(self.width * self.height)
+        self.rows = [0] * self.height
+        self.heights = [0] * self.width
+        self._rebuild_stats()
+
+    def load_cells(self, cells) -> None:
+        """Substitui todas as células (ids, linha a linha) e recalcula as máscaras."""
+        self.cells = bytearray(cells)
+        w = self.width
+        self.rows = shape_row_masks(
+            self.cells[r * w:(r + 1) * w] for r in range(self.height)
+        )
+        self.heights = [self._column_height(c) for c in range(w)]
+        self._rebuild_stats()
+
+    def copy(self) -> "Board":
+        """Cópia independente (para testar jogadas sem mexer no tabuleiro do jogo)."""
+        other = copy.copy(self)
+        other.cells = bytearray(self.cells)
+        other.rows = self.rows[:]
+        other.heights = self.heights[:]
+        other.filled = self.filled[:]
+        other.wells = self.wells[:]
+        return other
+
+    # ---------- métricas ----------
+
+    def _rebuild_stats(self) -> None:
+        """Recalcula todas as métricas (só em clear_all/load_cells)."""
+        w = self.width
+        self.filled = [
+            sum(1 for r in range(self.height) if self.rows[r] >> c & 1) for c in range(w)
+        ]
+        self.filled_total = sum(self.filled)
+        self.row_transitions = sum(row_transitions(m, w) for m in self.rows)
+        self._rebuild_profile()
+
+    def _rebuild_profile(self) -> None:
+        """Métricas que dependem só de `heights`: O(largura)."""
+        heights = self.heights
+        self.aggregate_height = sum(heights)
+        self.bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+        self.wells = [self._well_depth(c) for c in range(self.width)]
+        self.well_sum = sum(self.wells)
+
+    def _well_depth(self, c: int) -> int:
+        """Quanto a coluna está abaixo da vizinha mais baixa (parede conta como alta)."""
+        heights = self.heights
+        if c == 0:
+            if self.width == 1:
+                return 0
+            side = heights[1]
+        elif c == self.width - 1:
+            side = heights[c - 1]
+        else:
+            side = min(heights[c - 1], heights[c + 1])
+        return max(0, side - heights[c])
+
+    def _set_height(self, c: int, h: int) -> None:
+        """Troca a altura de uma coluna e acerta bumpiness e poços das vizinhas."""
+        heights = self.heights
+        old = heights[c]
+        if h == old:
+            return
+        lo = max(0, c - 1)
+        hi = min(self.width - 1, c + 1)
+        for k in range(lo, hi):
+            self.bumpiness -= abs(heights[k] - heights[k + 1])
+        heights[c] = h
+        for k in range(lo, hi):
+            self.bumpiness += abs(heights[k] - heights[k + 1])
+        self.aggregate_height += h - old
+        wells = self.wells
+        for k in range(lo, hi + 1):
+            depth = self._well_depth(k)
+            self.well_sum += depth - wells[k]
+            wells[k] = depth
+
+    @property
+    def holes(self) -> int:
+        return self.aggregate_height - self.filled_total
+
+    def column_holes(self, c: int) -> int:
+        return self.heights[c] - self.filled[c]
+
+    def features(self) -> BoardFeatures:
+        return BoardFeatures(
+            aggregate_height=self.aggregate_height,
+            max_height=max(self.heights),
+            holes=self.holes,
+            bumpiness=self.bumpiness,
+            wells=tuple(self.wells),
+            row_transitions=self.row_transitions,
+        )
+
+    def features_after(self, state, x: int, y: int = 0,
+                       piece_id: int = 1) -> Optional[Tuple[BoardFeatures, int]]:
+        """
+        Métricas depois de largar a peça (estado de rotação) da coluna x a
+        partir da linha y, travar e limpar linhas; retorna (métricas, linhas
+        limpas) ou None se a peça nem cabe ali. O tabuleiro não muda.
+        """
+        if not self.fits(state.masks, x, y):
+            return None
+        board = self.copy()
+        board.place(state, x, y + board.drop_distance(state, x, y), piece_id)
+        cleared = board.clear_lines()
+        return board.features(), cleared
+
+    def _column_height(self, c: int) -> int:
+        """Altura da coluna pelas máscaras (usado só quando o topo some)."""
+        bit = 1 << c
+        rows = self.rows
         for r in range(self.height):
-            for c in range(self.width):
-                self.grid[r][c] = 0
+            if rows[r] & bit:
+                return self.height - r
+        return 0
 
-    def is_valid_move(self, shape, x, y):
-        for r in range(len(shape)):
-            for c in range(len(shape[0])):
-                if shape[r][c]:
-                    bx = x + c
-                    by = y + r
-                    if bx < 0 or bx >= self.width or by < 0 or by >= self.height:
-                        return False
-                    if self.grid[by][bx] != 0:
-                        return False
+    def load_grid(self, grid) -> None:
+        """Carrega uma matriz (linha, coluna) de ids de peça."""
+        self.load_cells(bytes(v for row in grid for v in row))
+
+    def fits(self, masks, x, y) -> bool:
+        """
+        Testa se uma peça, dada pelas máscaras de linha, cabe em (x, y).
+        """
+        rows = self.rows
+        full = self.full_mask
+        height = self.height
+        for r, m in enumerate(masks):
+            if not m:
+                continue
+            by = y + r
+            if by < 0 or by >= height:
+                return False
+            if x >= 0:
+                shifted = m << x
+            else:
+                # bits que sairiam pela esquerda = fora do tabuleiro
+                if m & ((1 << -x) - 1):
+                    return False
+                shifted = m >> -x
+            if shifted & ~full or shifted & rows[by]:
+                return False
         return True
 
+    def is_valid_move(self, shape, x, y):
+        return self.fits(shape_row_masks(shape), x, y)
+
+    def drop_distance(self, state, x, y) -> int:
+        """
+        Quantas linhas a peça (estado de rotação em (x, y)) ainda cai.
+        Com a peça acima da pilha em todas as suas colunas, é o menor vão
+        entre o perfil de baixo da peça e o topo de cada coluna: O(largura).
+        Peça enfiada embaixo de uma saliência cai teste a teste, como antes.
+        """
+        top = self.height
+        heights = self.heights
+        dist = top
+        for c, r in state.bottom:
+            bx = x + c
+            # linha livre logo acima do topo da coluna, menos a célula mais baixa da peça
+            gap = top - heights[bx] - 1 - (y + r)
+            if gap < 0:
+                dist = -1
+                break
+            if gap < dist:
+                dist = gap
+        if dist >= 0 and y >= 0:
+            return dist
+        masks = state.masks
+        dist = 0
+        while self.fits(masks, x, y + dist + 1):
+            dist += 1
+        return dist
+
     def merge(self, piece):
-        s = piece.shape
-        for r in range(len(s)):
-            for c in range(len(s[0])):
-                if s[r][c]:
-                    bx = piece.x + c
-                    by = piece.y + r
-                    if 0 <= by < self.height and 0 <= bx < self.width:
-                        self.grid[by][bx] = piece.color
+        self.place(piece.state, piece.x, piece.y, piece.piece_id)
+
+    def place(self, state, x: int, y: int, piece_id: int) -> None:
+        """Grava o estado de rotação em (x, y) e atualiza as métricas das colunas e linhas tocadas."""
+        w = self.width
+        cells = self.cells
+        rows = self.rows
+        touched = {}
+        for r, c in state.cells:
+            bx = x + c
+            by = y + r
+            if 0 <= by < self.height and 0 <= bx < w:
+                i = by * w + bx
+                if not cells[i]:
+                    self.filled[bx] += 1
+                    self.filled_total += 1
+                cells[i] = piece_id
+                if by not in touched:
+                    touched[by] = rows[by]
+                rows[by] |= 1 << bx
+                h = self.height - by
+                if h > self.heights[bx]:
+                    self._set_height(bx, h)
+        for by, old in touched.items():
+            self.row_transitions += row_transitions(rows[by], w) - row_transitions(old, w)
 
     def clear_lines(self) -> int:
-        cleared = 0
-        r = self.height - 1
-        while r >= 0:
-            if all(self.grid[r][c] != 0 for c in range(self.width)):
-                del self.grid[r]
-                self.grid.insert(0, [0 for _ in range(self.width)])
-                cleared += 1
-            else:
-                r -= 1
+        full = self.full_mask
+        keep = [r for r in range(self.height) if self.rows[r] != full]
+        cleared = self.height - len(keep)
+        if cleared:
+            w = self.width
+            cells = bytearray(cleared * w)
+            for r in keep:
+                cells += self.cells[r * w:(r + 1) * w]
+            self.cells = cells
+            self.rows = [0] * cleared + [self.rows[r] for r in keep]
+            # toda linha cheia passa por todas as colunas: cada altura cai
+            # `cleared`, a não ser que o topo da coluna estivesse numa linha
+            # limpa (aí a célula esperada está vazia e a coluna é relida)
+            heights = self.heights
+            for c in range(w):
+                h = heights[c] - cleared
+                if h > 0 and self.rows[self.height - h] >> c & 1:
+                    heights[c] = h
+                else:
+                    heights[c] = self._column_height(c)
+            # cada linha cheia tinha uma célula por coluna e 0 transições;
+            # as linhas vazias que entram em cima têm 2 (as paredes)
+            self.filled = [f - cleared for f in self.filled]
+            self.filled_total -= cleared * w
+            self.row_transitions += 2 * cleared
+            self._rebuild_profile()
         return cleared
 
     def get_cell(self, r, c):
-        return self.grid[r][c]
+        return self.cells[r * self.width + c]
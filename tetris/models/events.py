@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class GameEvent:
+    """Base dos eventos do TetrisGame; `revision` é a revisão do jogo logo após a mudança."""
+    revision: int
+
+
+@dataclass(frozen=True)
+class PieceMoved(GameEvent):
+    """A peça atual andou, caiu ou girou (hard drop gera um só, com a posição final)."""
+    x: int
+    y: int
+    rotation: int
+
+
+@dataclass(frozen=True)
+class PieceLocked(GameEvent):
+    """A peça foi fixada no tabuleiro; a próxima já entrou em jogo."""
+    piece_id: int
+    x: int
+    y: int
+    rotation: int
+
+
+@dataclass(frozen=True)
+class LinesCleared(GameEvent):
+    count: int
+    lines: int   # total da partida
+    score: int
+
+
+@dataclass(frozen=True)
+class LevelUp(GameEvent):
+    level: int
+
+
+@dataclass(frozen=True)
+class GameOver(GameEvent):
+    score: int
+    lines: int
+    level: int
@@ -3,19 +3,33 @@ from __future__ import annotations
 import random
 from tetris.models.board import Board
 from tetris.models.tetromino import Tetromino
+from tetris.models import events
 from tetris.core.factory import random_piece
-from tetris.core.constants import BOARD_WIDTH, BOARD_HEIGHT, BASE_FALL_INTERVAL, MAX_LEVEL_SPEED_MULTIPLIER
+from tetris.core.constants import BOARD_WIDTH, BOARD_HEIGHT, BASE_FALL_INTERVAL, MAX_LEVEL_SPEED_MULTIPLIER, TICK_DT
+
+# Pontuação estilo clássico por linhas limpas de uma vez (multiplicado pelo nível)
+LINE_CLEAR_SCORES = {1: 40, 2: 100, 3: 300, 4: 1200}
+
+
+def fall_interval_for_level(level: int) -> float:
+    capped = min(level, 10)
+    mult = 1.0 + (capped - 1) * ((MAX_LEVEL_SPEED_MULTIPLIER - 1.0) / (10 - 1))
+    return BASE_FALL_INTERVAL / mult
+
 
 class TetrisGame:
     def __init__(self, rng_seed: int | None = None):
         # RNG determinístico da partida
+        self.rng_seed = rng_seed
         self._rng = random.Random(rng_seed) if rng_seed is not None else random.Random()
+        # peças já sorteadas: com a seed, isso basta para recriar o RNG
+        self.pieces_drawn = 0
 
         self.board = Board(BOARD_WIDTH, BOARD_HEIGHT)
 
         # peças inicial e próxima usando o RNG interno
-        self.current: Tetromino = random_piece(self._rng)
-        self.next_piece: Tetromino = random_piece(self._rng)
+        self.current: Tetromino = self._draw_piece()
+        self.next_piece: Tetromino = self._draw_piece()
         self.current.spawn(BOARD_WIDTH // 2 - 2, 0)
 
         self.score = 0
@@ -25,14 +39,65 @@ class TetrisGame:
         self.paused = False
 
         self._fall_acc = 0.0
+        # ticks lógicos já jogados (base da linha do tempo do replay)
+        self.tick_count = 0
+        self.pieces_locked = 0
+
+        # revisões: sobem a cada mudança, então quem desenha ou grava compara
+        # números em vez de varrer o jogo. board_revision = células fixas ou
+        # próxima peça; stats_revision = pontuação, linhas ou nível.
+        self.revision = 0
+        self.board_revision = 0
+        self.stats_revision = 0
+        self._listeners: list = []
+
+    # ----- Revisões e eventos -----
+    def subscribe(self, listener):
+        """
+        `listener(evento)` recebe os eventos de tetris.models.events, na thread
+        que mexe no jogo. Retorna a função que cancela a inscrição.
+        """
+        self._listeners.append(listener)
+
+        def unsubscribe():
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+        return unsubscribe
+
+    def _touch(self, board: bool = False, stats: bool = False) -> int:
+        self.revision += 1
+        if board:
+            self.board_revision = self.revision
+        if stats:
+            self.stats_revision = self.revision
+        return self.revision
+
+    def _emit(self, event) -> None:
+        for listener in tuple(self._listeners):
+            listener(event)
+
+    def _moved(self, stats: bool = False) -> None:
+        rev = self._touch(stats=stats)
+        if self._listeners:
+            p = self.current
+            self._emit(events.PieceMoved(rev, p.x, p.y, p.rotation))
 
     # ----- Progressão de níveis / velocidade -----
     def fall_interval(self) -> float:
-        capped = min(self.level, 10)
-        mult = 1.0 + (capped - 1) * ((MAX_LEVEL_SPEED_MULTIPLIER - 1.0) / (10 - 1))
-        return BASE_FALL_INTERVAL / mult
+        return fall_interval_for_level(self.level)
 
     # ----- Ciclo de atualização -----
+    def step(self) -> None:
+        """
+        Avança exatamente um tick lógico (TICK_DT).
+        Pausa e game over não contam ticks, então a mesma sequência de
+        steps + entradas sempre produz o mesmo jogo.
+        """
+        if self.paused or self.game_over:
+            return
+        self.tick_count += 1
+        self.tick(TICK_DT)
+
     def tick(self, delta_time: float) -> None:
         if self.paused or self.game_over:
             return
@@ -43,75 +108,107 @@ class TetrisGame:
             self._gravity_step()
 
     def _gravity_step(self) -> None:
-        if self.board.is_valid_move(self.current.shape, self.current.x, self.current.y + 1):
+        if self.board.fits(self.current.masks, self.current.x, self.current.y + 1):
             self.current.move(0, 1)
+            self._moved()
         else:
             self._lock_piece()
 
     def _lock_piece(self) -> None:
-        self.board.merge(self.current)
+        locked = self.current
+        self.board.merge(locked)
+        self.pieces_locked += 1
         cleared = self.board.clear_lines()
+        old_level = self.level
         if cleared:
             self.lines += cleared
-            # Pontuação estilo clássico (multiplicado pelo nível)
-            self.score += {1: 40, 2: 100, 3: 300, 4: 1200}.get(cleared, 0) * self.level
+            self.score += LINE_CLEAR_SCORES.get(cleared, 0) * self.level
             self.level = 1 + self.lines // 10  # sobe a cada 10 linhas
         self._spawn_next()
 
+        rev = self._touch(board=True, stats=bool(cleared))
+        if self._listeners:
+            self._emit(events.PieceLocked(rev, locked.piece_id, locked.x, locked.y, locked.rotation))
+            if cleared:
+                self._emit(events.LinesCleared(rev, cleared, self.lines, self.score))
+            if self.level != old_level:
+                self._emit(events.LevelUp(rev, self.level))
+            if self.game_over:
+                self._emit(events.GameOver(rev, self.score, self.lines, self.level))
+
+    def _draw_piece(self) -> Tetromino:
+        self.pieces_drawn += 1
+        return random_piece(self._rng)
+
     def _spawn_next(self) -> None:
         self.current = self.next_piece
-        self.next_piece = random_piece(self._rng)
+        self.next_piece = self._draw_piece()
         self.current.spawn(BOARD_WIDTH // 2 - 2, 0)
 
         # Se não couber, é game over (modo clássico)
-        if not self.board.is_valid_move(self.current.shape, self.current.x, self.current.y):
+        if not self.board.fits(self.current.masks, self.current.x, self.current.y):
             self.game_over = True
 
     # ----- Entradas do jogador -----
     def move_left(self) -> None:
         if self._can_act():
-            if self.board.is_valid_move(self.current.shape, self.current.x - 1, self.current.y):
+            if self.board.fits(self.current.masks, self.current.x - 1, self.current.y):
                 self.current.move(-1, 0)
+                self._moved()
 
     def move_right(self) -> None:
         if self._can_act():
-            if self.board.is_valid_move(self.current.shape, self.current.x + 1, self.current.y):
+            if self.board.fits(self.current.masks, self.current.x + 1, self.current.y):
                 self.current.move(1, 0)
+                self._moved()
 
     def soft_drop(self) -> None:
         if self._can_act():
-            if self.board.is_valid_move(self.current.shape, self.current.x, self.current.y + 1):
+            if self.board.fits(self.current.masks, self.current.x, self.current.y + 1):
                 self.current.move(0, 1)
                 self.score += 1  # bônus de soft drop
+                self._moved(stats=True)
 
     def hard_drop(self) -> None:
         if not self._can_act():
             return
-        steps = 0
-        while self.board.is_valid_move(self.current.shape, self.current.x, self.current.y + 1):
-            self.current.move(0, 1)
-            steps += 1
+        steps = self.drop_distance()
         self.score += 2 * steps
+        if steps:
+            self.current.move(0, steps)
+            self._moved(stats=True)
         self._lock_piece()
 
+    def drop_distance(self) -> int:
+        """Quantas linhas a peça atual cai até travar (base do hard drop e da peça fantasma)."""
+        p = self.current
+        return self.board.drop_distance(p.state, p.x, p.y)
+
     def rotate(self) -> None:
         if not self._can_act():
             return
-        rotated = self.current.peek_rotate()
+        # estado pré-calculado: nada é alocado nas tentativas de wall kick
+        masks = self.current.peek_state().masks
         x, y = self.current.x, self.current.y
         for dx in (0, -1, 1, -2, 2):
-            if self.board.is_valid_move(rotated, x + dx, y):
-                self.current.shape = rotated
+            if self.board.fits(masks, x + dx, y):
+                self.current.apply_rotate()
                 self.current.x = x + dx
+                self._moved()
                 return
 
     def toggle_pause(self) -> None:
         if not self.game_over:
             self.paused = not self.paused
+            self._touch()
 
     def _can_act(self) -> bool:
         return not self.paused and not self.game_over
 
     # ----- Reinício (modo clássico) -----
     def reset(self, rng_seed: int | None = None) -> None:
+        # inscritos e revisão continuam: a revisão nunca volta para trás
+        listeners, revision = self._listeners, self.revision
         self.__init__(rng_seed)
+        self._listeners = listeners
+        self.revision = self.board_revision = self.stats_revision = revision + 1
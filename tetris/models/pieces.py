@@ -1,4 +1,4 @@
-from tetris.models.tetromino import Tetromino
+from tetris.models.tetromino import Tetromino, PieceKind, rotation_states
 
 CYAN    = ( 86, 180, 233)
 YELLOW  = (240, 228,  66)
@@ -8,10 +8,55 @@ RED     = (213,  94,   0)
 BLUE    = (  0, 114, 178)
 ORANGE  = (230, 159,   0)
 
-def I_piece(): return Tetromino([[1,1,1,1]], CYAN)
-def O_piece(): return Tetromino([[1,1],[1,1]], YELLOW)
-def T_piece(): return Tetromino([[0,1,0],[1,1,1]], MAGENTA)
-def S_piece(): return Tetromino([[0,1,1],[1,1,0]], GREEN)
-def Z_piece(): return Tetromino([[1,1,0],[0,1,1]], RED)
-def J_piece(): return Tetromino([[1,0,0],[1,1,1]], BLUE)
-def L_piece(): return Tetromino([[0,0,1],[1,1,1]], ORANGE)
+# tabelas estáticas de rotação: girar é só trocar o índice
+I_KIND = PieceKind("I", CYAN,    rotation_states([[1,1,1,1]]),          1)
+O_KIND = PieceKind("O", YELLOW,  rotation_states([[1,1],[1,1]]),        2)
+T_KIND = PieceKind("T", MAGENTA, rotation_states([[0,1,0],[1,1,1]]),    3)
+S_KIND = PieceKind("S", GREEN,   rotation_states([[0,1,1],[1,1,0]]),    4)
+Z_KIND = PieceKind("Z", RED,     rotation_states([[1,1,0],[0,1,1]]),    5)
+J_KIND = PieceKind("J", BLUE,    rotation_states([[1,0,0],[1,1,1]]),    6)
+L_KIND = PieceKind("L", ORANGE,  rotation_states([[0,0,1],[1,1,1]]),    7)
+
+PIECE_KINDS = [I_KIND, O_KIND, T_KIND, S_KIND, Z_KIND, J_KIND, L_KIND]
+
+# paleta padrão: id da célula -> cor (0 = vazio)
+PIECE_PALETTE = [None] + [k.color for k in PIECE_KINDS]
+
+_KIND_BY_COLOR = {k.color: k for k in PIECE_KINDS}
+
+def I_piece(): return Tetromino.from_kind(I_KIND)
+def O_piece(): return Tetromino.from_kind(O_KIND)
+def T_piece(): return Tetromino.from_kind(T_KIND)
+def S_piece(): return Tetromino.from_kind(S_KIND)
+def Z_piece(): return Tetromino.from_kind(Z_KIND)
+def J_piece(): return Tetromino.from_kind(J_KIND)
+def L_piece(): return Tetromino.from_kind(L_KIND)
+
+def color_to_id(color) -> int:
+    """Id de peça de uma cor gravada em saves antigos (0 = vazio)."""
+    if not color:
+        return 0
+    return _KIND_BY_COLOR[tuple(color)].piece_id
+
+def kind_id(shape, color) -> int:
+    """
+    Id de peça de um Tetromino sem PieceKind: pela cor (como nos saves
+    antigos) ou, se a cor não é de nenhum tipo, pelo formato.
+    """
+    kind = _KIND_BY_COLOR.get(tuple(color)) if color else None
+    if kind is None:
+        normalized = rotation_states(shape)[0].shape
+        kind = next((k for k in PIECE_KINDS if normalized in [s.shape for s in k.states]), None)
+    if kind is None:
+        raise ValueError(f"peça desconhecida: {shape}")
+    return kind.piece_id
+
+def piece_from_shape(shape, color) -> Tetromino:
+    """
+    Reconstrói uma peça de save antigo (formato + cor):
+    o tipo vem da cor e a rotação do formato.
+    """
+    kind = _KIND_BY_COLOR[tuple(color)]
+    normalized = rotation_states(shape)[0].shape
+    rotation = [s.shape for s in kind.states].index(normalized)
+    return Tetromino.from_kind(kind, rotation)
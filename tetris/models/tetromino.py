@@ -1,5 +1,81 @@
-from dataclasses import dataclass
-from typing import List
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+
+@dataclass(frozen=True)
+class RotationState:
+    """
+    Uma das 4 rotações de uma peça, pré-calculada:
+    matriz, células ocupadas (linha, coluna), caixa e máscaras por linha.
+    `bottom` é o perfil de baixo: (coluna, linha da célula mais baixa).
+    """
+    shape: Tuple[Tuple[int, ...], ...]
+    cells: Tuple[Tuple[int, int], ...]
+    width: int
+    height: int
+    masks: Tuple[int, ...]
+    bottom: Tuple[Tuple[int, int], ...] = ()
+
+
+@dataclass(frozen=True)
+class PieceKind:
+    """Tipo de peça (I, O, T...) com a tabela estática das suas rotações."""
+    name: str
+    color: tuple  # RGB padrão (a paleta da view pode trocar)
+    states: Tuple[RotationState, ...]
+    piece_id: int = 0  # valor gravado nas células do Board (1..7)
+
+
+def _rotate_cw(shape):
+    rows = len(shape)
+    cols = len(shape[0])
+    return tuple(
+        tuple(shape[rows - 1 - r][c] for r in range(rows))
+        for c in range(cols)
+    )
+
+
+def _make_state(shape) -> RotationState:
+    cells = tuple(
+        (r, c)
+        for r in range(len(shape))
+        for c in range(len(shape[0]))
+        if shape[r][c]
+    )
+    masks = tuple(
+        sum(1 << c for c, v in enumerate(row) if v)
+        for row in shape
+    )
+    lowest: dict = {}
+    for r, c in cells:
+        lowest[c] = max(r, lowest.get(c, r))
+    bottom = tuple(sorted(lowest.items()))
+    return RotationState(shape, cells, len(shape[0]), len(shape), masks, bottom)
+
+
+# cache por formato: peças carregadas de saves antigos reaproveitam a mesma tabela
+_ROTATION_TABLES: dict = {}
+
+
+def rotation_states(shape) -> Tuple[RotationState, ...]:
+    """
+    Retorna as 4 rotações (sentido horário) a partir de `shape`.
+    Calculado uma vez por formato.
+    """
+    key = tuple(tuple(1 if v else 0 for v in row) for row in shape)
+    table = _ROTATION_TABLES.get(key)
+    if table is None:
+        states = []
+        s = key
+        for _ in range(4):
+            states.append(_make_state(s))
+            s = _rotate_cw(s)
+        table = tuple(states)
+        _ROTATION_TABLES[key] = table
+    return table
+
 
 @dataclass
 class Tetromino:
@@ -7,6 +83,39 @@ class Tetromino:
     color: tuple  # RGB
     x: int = 0
     y: int = 0
+    rotation: int = 0
+    kind: PieceKind | None = field(default=None, compare=False)
+    states: Tuple[RotationState, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.kind is not None:
+            self.states = self.kind.states
+        else:
+            # formato avulso (ex.: save antigo): a rotação 0 é o próprio shape
+            self.states = rotation_states(self.shape)
+            self.rotation = 0
+        self.rotation %= 4
+        self.shape = self.states[self.rotation].shape
+
+    @classmethod
+    def from_kind(cls, kind: PieceKind, rotation: int = 0) -> "Tetromino":
+        return cls(kind.states[rotation % 4].shape, kind.color, rotation=rotation, kind=kind)
+
+    @property
+    def state(self) -> RotationState:
+        return self.states[self.rotation]
+
+    @property
+    def piece_id(self) -> int:
+        if self.kind is not None:
+            return self.kind.piece_id
+        # formato avulso: o id sai da cor/formato (import aqui, pieces importa este módulo)
+        from tetris.models.pieces import kind_id
+        return kind_id(self.shape, self.color)
+
+    @property
+    def masks(self) -> Tuple[int, ...]:
+        return self.states[self.rotation].masks
 
     def spawn(self, x, y):
         self.x, self.y = x, y
@@ -15,14 +124,15 @@ class Tetromino:
         self.x += dx
         self.y += dy
 
+    def peek_state(self, turns: int = 1) -> RotationState:
+        return self.states[(self.rotation + turns) % 4]
+
+    def set_rotation(self, rotation: int) -> None:
+        self.rotation = rotation % 4
+        self.shape = self.states[self.rotation].shape
+
     def peek_rotate(self):
-        rows = len(self.shape)
-        cols = len(self.shape[0])
-        rotated = [[0 for _ in range(rows)] for _ in range(cols)]
-        for r in range(rows):
-            for c in range(cols):
-                rotated[c][rows - 1 - r] = self.shape[r][c]
-        return rotated
+        return self.peek_state().shape
 
     def apply_rotate(self):
-        self.shape = self.peek_rotate()
+        self.set_rotation(self.rotation + 1)
@@ -0,0 +1,195 @@
+# tetris/view/blocks.py
+"""
+Blocos 8-bit do tabuleiro desenhados com sprites.
+
+O visual de um bloco (borda, brilho, sombra) é pintado uma vez por cor e
+tamanho numa textura, e o arcade junta essas texturas no atlas da SpriteList.
+`BlockGrid` cria um sprite por célula uma única vez; a cada quadro só as
+células que mudaram trocam de textura. O tabuleiro inteiro sai numa chamada
+de desenho, em vez de 8 retângulos por bloco.
+"""
+from __future__ import annotations
+
+import arcade
+from PIL import Image, ImageDraw
+
+
+# ---------- helpers da estilização 8-bit ----------
+
+def _clamp(x: int) -> int:
+    return max(0, min(255, x))
+
+
+def _shade(rgb: tuple, factor: float) -> tuple:
+    r, g, b, *a = rgb
+    alpha = a[0] if a else 255
+    return (
+        _clamp(int(r * factor)),
+        _clamp(int(g * factor)),
+        _clamp(int(b * factor)),
+        alpha,
+    )
+
+
+def _mix(rgb: tuple, other: tuple, t: float) -> tuple:
+    r1, g1, b1, *a1 = rgb
+    r2, g2, b2, *a2 = other
+    alpha1 = a1[0] if a1 else 255
+    alpha2 = a2[0] if a2 else 255
+    return (
+        _clamp(int(r1 + (r2 - r1) * t)),
+        _clamp(int(g1 + (g2 - g1) * t)),
+        _clamp(int(b1 + (b2 - b1) * t)),
+        _clamp(int(alpha1 + (alpha2 - alpha1) * t)),
+    )
+
+
+def block_rects(size: float, base: tuple) -> list[tuple]:
+    """
+    Retângulos (x, y, largura, altura, cor) de um bloco, a partir do canto
+    inferior esquerdo, na ordem de pintura.
+    """
+    u = max(1.0, size / 8.0)
+    border_col = _shade(base, 0.55)
+    fill_col = base
+    light_col = _mix(base, (255, 255, 255, 255), 0.35)
+    dark_col = _shade(base, 0.75)
+    shine = (255, 255, 255, 100)
+    return [
+        (0, 0, size, size, border_col),
+        (u, u, size - 2 * u, size - 2 * u, fill_col),
+        (u, size - 2 * u, size - 3 * u, u, light_col),
+        (u, u, u, size - 3 * u, light_col),
+        (2 * u, u, size - 3 * u, u, dark_col),
+        (size - 2 * u, 2 * u, u, size - 3 * u, dark_col),
+        (2 * u, size - 3 * u, u, u, shine),
+        (3 * u, size - 4 * u, u, u, shine),
+    ]
+
+
+def block_image(base: tuple, size: int) -> Image.Image:
+    """Pinta o bloco (retângulos de block_rects) numa imagem RGBA size x size."""
+    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    for x, y, w, h, col in block_rects(size, base):
+        if w <= 0 or h <= 0:
+            continue
+        # o arcade mede de baixo para cima; o PIL, de cima para baixo
+        x0, x1 = round(x), round(x + w)
+        y0, y1 = round(size - (y + h)), round(size - y)
+        if x1 <= x0 or y1 <= y0:
+            continue
+        layer = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+        ImageDraw.Draw(layer).rectangle((x0, y0, x1 - 1, y1 - 1), fill=tuple(col))
+        # composição com alpha, como o blend do arcade (o brilho é translúcido)
+        img = Image.alpha_composite(img, layer)
+    return img
+
+
+def ghost_image(base: tuple, size: int) -> Image.Image:
+    """Peça fantasma: só o contorno na cor da peça, com o miolo quase transparente."""
+    r, g, b, *_ = base
+    u = max(1, round(size / 8))
+    img = Image.new("RGBA", (size, size), (r, g, b, 170))
+    ImageDraw.Draw(img).rectangle((u, u, size - u - 1, size - u - 1), fill=(r, g, b, 45))
+    return img
+
+
+# (estilo, cor, tamanho) -> textura; cada bloco é pintado uma vez por execução
+_TEXTURES: dict[tuple, arcade.Texture] = {}
+
+
+def _texture(style: str, paint, base: tuple, size: int) -> arcade.Texture:
+    key = (style, tuple(base), size)
+    tex = _TEXTURES.get(key)
+    if tex is None:
+        name = "-".join(map(str, key[1]))
+        tex = arcade.Texture(
+            paint(base, size),
+            hash=f"{style}-{name}-{size}",
+            hit_box_algorithm=arcade.hitbox.algo_bounding_box,
+        )
+        _TEXTURES[key] = tex
+    return tex
+
+
+def block_texture(base: tuple, size: int) -> arcade.Texture:
+    return _texture("block8", block_image, base, size)
+
+
+def ghost_texture(base: tuple, size: int) -> arcade.Texture:
+    return _texture("ghost", ghost_image, base, size)
+
+
+def stamp_piece(cells: bytearray, width: int, height: int, piece, x: int, y: int,
+                piece_id: int | None = None) -> None:
+    """Escreve o id da peça (ou `piece_id`) em `cells` (linha 0 em cima), com ela em (x, y)."""
+    if piece_id is None:
+        piece_id = piece.piece_id
+    for r, c in piece.state.cells:
+        bx = x + c
+        by = y + r
+        if 0 <= by < height and 0 <= bx < width:
+            cells[by * width + bx] = piece_id
+
+
+class BlockGrid:
+    """
+    Grade width x height de sprites de bloco, com a linha 0 em cima.
+
+    `update(cells)` recebe os ids de peça por célula (0 = vazio, como no
+    Board.cells) e só mexe nos sprites que mudaram desde a última chamada.
+    Ids a partir de `ghost_offset + 1` são a peça fantasma do id
+    correspondente.
+    Os sprites entram na `sprite_list` recebida, dividida com as outras
+    grades (uma chamada de desenho para todas, no BoardRenderer).
+    """
+
+    def __init__(self, width: int, height: int, cell_size: float, left: float, bottom: float,
+                 palette, sprite_list: arcade.SpriteList):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        size = max(1, int(round(cell_size)))
+        # índice 0 (vazio) nunca é desenhado; depois dos blocos vêm os fantasmas
+        self.ghost_offset = len(palette) - 1
+        self.textures = (
+            [None]
+            + [block_texture(color, size) for color in palette[1:]]
+            + [ghost_texture(color, size) for color in palette[1:]]
+        )
+        scale = cell_size / size
+
+        self._shown = bytearray(width * height)
+        self._sprites: list[arcade.Sprite] = []
+        for r in range(height):
+            for c in range(width):
+                sprite = arcade.Sprite(
+                    self.textures[1],
+                    scale=scale,
+                    center_x=left + c * cell_size + cell_size / 2,
+                    center_y=bottom + (height - 1 - r) * cell_size + cell_size / 2,
+                )
+                sprite.visible = False
+                self._sprites.append(sprite)
+        sprite_list.extend(self._sprites)
+
+    def update(self, cells) -> int:
+        """Aplica o novo conteúdo; retorna quantas células mudaram."""
+        shown = self._shown
+        if shown == cells:
+            return 0
+        changed = 0
+        sprites = self._sprites
+        textures = self.textures
+        for i, (old, new) in enumerate(zip(shown, cells)):
+            if old == new:
+                continue
+            sprite = sprites[i]
+            if new:
+                sprite.texture = textures[new]
+                sprite.visible = True
+            else:
+                sprite.visible = False
+            changed += 1
+        shown[:] = cells
+        return changed
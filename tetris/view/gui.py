@@ -1,76 +1,28 @@
 from __future__ import annotations
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 import arcade
+from pyglet.graphics import Batch
 from arcade.gui import UIManager, UIFlatButton, UIInputText
 from arcade.gui.events import UITextInputEvent
 
 from tetris.models.game import TetrisGame
+from tetris.models.pieces import PIECE_PALETTE
 from tetris.core.constants import *
-from db import repository
-from tetris.core import state_codec
-
-
-# ---------- helpers da estilização 8-bit ----------
-
-def _clamp(x: int) -> int:
-    return max(0, min(255, x))
-
-
-def _shade(rgb: tuple, factor: float) -> tuple:
-    r, g, b, *a = rgb
-    alpha = a[0] if a else 255
-    return (
-        _clamp(int(r * factor)),
-        _clamp(int(g * factor)),
-        _clamp(int(b * factor)),
-        alpha,
-    )
-
-
-def _mix(rgb: tuple, other: tuple, t: float) -> tuple:
-    r1, g1, b1, *a1 = rgb
-    r2, g2, b2, *a2 = other
-    alpha1 = a1[0] if a1 else 255
-    alpha2 = a2[0] if a2 else 255
-    return (
-        _clamp(int(r1 + (r2 - r1) * t)),
-        _clamp(int(g1 + (g2 - g1) * t)),
-        _clamp(int(b1 + (b2 - b1) * t)),
-        _clamp(int(alpha1 + (alpha2 - alpha1) * t)),
-    )
-
-
-def draw_block_8bit(left: float, bottom: float, size: float, base: tuple):
-    u = max(1.0, size / 8.0)
-    border_col = _shade(base, 0.55)
-    fill_col = base
-    light_col = _mix(base, (255, 255, 255, 255), 0.35)
-    dark_col = _shade(base, 0.75)
-    shine = (255, 255, 255, 100)
-
-    arcade.draw_lbwh_rectangle_filled(left, bottom, size, size, border_col)
-    arcade.draw_lbwh_rectangle_filled(
-        left + u, bottom + u, size - 2 * u, size - 2 * u, fill_col
-    )
-    arcade.draw_lbwh_rectangle_filled(
-        left + u, bottom + size - 2 * u, size - 3 * u, u, light_col
-    )
-    arcade.draw_lbwh_rectangle_filled(
-        left + u, bottom + u, u, size - 3 * u, light_col
-    )
-    arcade.draw_lbwh_rectangle_filled(
-        left + 2 * u, bottom + u, size - 3 * u, u, dark_col
-    )
-    arcade.draw_lbwh_rectangle_filled(
-        left + size - 2 * u, bottom + 2 * u, u, size - 3 * u, dark_col
-    )
-    arcade.draw_lbwh_rectangle_filled(
-        left + 2 * u, bottom + size - 3 * u, u, u, shine
-    )
-    arcade.draw_lbwh_rectangle_filled(
-        left + 3 * u, bottom + size - 4 * u, u, u, shine
-    )
+from db import persistence
+from tetris.core.lazy import lazy_import
+from tetris.core import state_codec, save_codec, replay, replay_codec
+from tetris.view.renderer import BoardRenderer, StatsText, NEXT_PREVIEW_SIZE
+from tetris.view import layers
+
+# a camada de banco (SQLAlchemy, bcrypt) só é importada no primeiro uso,
+# normalmente já aquecida em segundo plano pelo main.py
+repository = lazy_import("db.repository")
+local_store = lazy_import("db.local_store")
+
+# login/registro (bcrypt é CPU puro, centenas de ms): pool próprio, fora da fila do banco
+_AUTH_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="auth")
 
 
 # ---------- paleta retrô ----------
@@ -84,6 +36,11 @@ RETRO_TEXT = (200, 255, 220, 255)
 
 RETRO_FONT = ("Press Start 2P", "Kenney Future", "Arial")
 
+# cor de cada id de peça guardado no tabuleiro (índice 0 = vazio);
+# trocar a paleta muda o visual sem mexer no estado do jogo
+BLOCK_PALETTE = list(PIECE_PALETTE)
+
+
 RETRO_BUTTON_STYLE = {
     "normal": {
         "font_name": RETRO_FONT,
@@ -120,6 +77,48 @@ RETRO_BUTTON_STYLE = {
 }
 
 
+# ============================================================
+#                 CARREGAMENTO ASSÍNCRONO DO BANCO
+# ============================================================
+
+
+class PendingLoads:
+    """
+    Consultas ao banco rodando fora do loop da janela.
+
+    A view dispara as consultas na construção e mostra placeholders; a cada
+    on_update, `poll` entrega os resultados prontos aos callbacks, sempre no
+    thread da janela (onde é seguro mexer em textos e widgets).
+    """
+
+    def __init__(self):
+        self._items: list = []
+
+    def start(self, key, fn, *args, on_done, default=None):
+        return self.track(persistence.fetch(key, fn, *args), on_done=on_done, default=default)
+
+    def track(self, fut, *, on_done, default=None):
+        """Acompanha um Future qualquer (ex.: de outro pool)."""
+        self._items.append((fut, on_done, default))
+        return fut
+
+    def poll(self) -> None:
+        if not self._items:
+            return
+        pending = []
+        for fut, on_done, default in self._items:
+            if not fut.done():
+                pending.append((fut, on_done, default))
+                continue
+            try:
+                result = fut.result()
+            except Exception as e:
+                print("[DB] consulta falhou:", e)
+                result = default
+            on_done(result)
+        self._items = pending
+
+
 # ============================================================
 #                    INPUT DE SENHA COM BOLINHAS
 # ============================================================
@@ -186,7 +185,16 @@ class LoginView(arcade.View):
         self.leader_panel_x = 0
         self.panel_y = 0
 
-        self.leaderboard_lines: list[str] = []
+        self.leaderboard_lines: list[str] = ["carregando..."]
+        self._auth_busy = False  # login/registro em andamento
+        self._loads = PendingLoads()
+        # lambda: o acesso a `repository` (e o import do banco) acontece no worker
+        self._loads.start(
+            "leaderboard",
+            lambda: repository.get_global_leaderboard(10),
+            on_done=self._build_leaderboard,
+            default=[],
+        )
 
     def on_show_view(self):
         self.window.set_size(WINDOW_WIDTH, WINDOW_HEIGHT)
@@ -300,13 +308,13 @@ class LoginView(arcade.View):
         def _on_register(_):
             self._handle_register()
 
-        self._build_leaderboard()
+    def on_update(self, delta_time: float):
+        self._loads.poll()
 
     # ---------- leaderboard ----------
 
-    def _build_leaderboard(self):
+    def _build_leaderboard(self, lb):
         self.leaderboard_lines = []
-        lb = repository.get_global_leaderboard(10)
         if not lb:
             self.leaderboard_lines.append("sem partidas ainda...")
             return
@@ -429,12 +437,23 @@ class LoginView(arcade.View):
             self.status_text.text = msg
 
     def _handle_login(self):
+        if self._auth_busy:
+            return
         username, password = self._get_creds()
         if not username or not password:
             self._set_status("Informe usuário e senha.")
             return
 
-        user = repository.authenticate_user(username, password)
+        # o hash roda no pool; a tela continua respondendo
+        self._auth_busy = True
+        self._set_status("Entrando...")
+        self._loads.track(
+            _AUTH_POOL.submit(lambda: local_store.authenticate_user(username, password)),
+            on_done=self._on_login_done,
+        )
+
+    def _on_login_done(self, user):
+        self._auth_busy = False
         if not user:
             self._set_status("Usuário ou senha inválidos.")
             return
@@ -443,12 +462,24 @@ class LoginView(arcade.View):
         self.window.show_view(MainMenuView(user_id=user["id"]))
 
     def _handle_register(self):
+        if self._auth_busy:
+            return
         username, password = self._get_creds()
         if not username or not password:
             self._set_status("Informe usuário e senha para registrar.")
             return
 
-        user_id, err = repository.create_user_account(username, password)
+        self._auth_busy = True
+        self._set_status("Criando usuário...")
+        self._loads.track(
+            _AUTH_POOL.submit(lambda: repository.create_user_account(username, password)),
+            on_done=self._on_register_done,
+            default=(None, "Erro ao criar usuário no banco."),
+        )
+
+    def _on_register_done(self, result):
+        self._auth_busy = False
+        user_id, err = result
         if err:
             self._set_status(err)
             return
@@ -462,18 +493,44 @@ class LoginView(arcade.View):
 # ============================================================
 
 
+# marca "não informado" nos parâmetros opcionais do menu (None é um valor válido)
+_UNSET = object()
+
+
 class MainMenuView(arcade.View):
     """
     Menu após login: mostra nick, recorde e opções de jogo/replay.
+
+    Nick, recorde e save ativo chegam do banco em segundo plano. Quem já
+    sabe esses dados (a partida que acabou de gravar) passa em
+    `saved_state` / `best_score` e poupa a consulta.
     """
 
-    def __init__(self, user_id: int):
+    def __init__(self, user_id: int, saved_state=_UNSET, best_score: int | None = None):
         super().__init__()
         self.ui = UIManager()
         self.user_id = user_id
-
-        self.user = repository.get_user_by_id(user_id)
-        self.best_score = repository.get_user_best_score(user_id)
+        self.background = layers.StaticLayer(self._build_background)
+
+        # dados do banco chegam depois; até lá a tela mostra placeholders
+        self.user = None
+        self.best_score = best_score
+        self._best_loaded = False
+        self._saved_state = saved_state
+
+        # mesma chave das escritas da partida: as leituras rodam depois delas
+        self._loads = PendingLoads()
+        # lambdas: o import preguiçoso de local_store acontece no worker, não aqui
+        self._loads.start(
+            user_id, lambda: local_store.get_user_by_id(user_id), on_done=self._on_user
+        )
+        self._loads.start(
+            user_id, lambda: local_store.get_user_best_score(user_id), on_done=self._on_best_score
+        )
+        if saved_state is _UNSET:
+            self._loads.start(
+                user_id, lambda: local_store.load_active_save(user_id), on_done=self._on_saved_state
+            )
 
         self.header_text: arcade.Text | None = None
         self.username_text: arcade.Text | None = None
@@ -488,9 +545,6 @@ class MainMenuView(arcade.View):
         self.ui.enable()
         self.ui.clear()
 
-        username = self.user["username"] if self.user else "Jogador"
-        best = self.best_score or 0
-
         sidebar_left = BOARD_WIDTH * CELL_SIZE
         right_center_x = sidebar_left + SIDEBAR_WIDTH / 2
 
@@ -505,7 +559,7 @@ class MainMenuView(arcade.View):
             font_name=RETRO_FONT,
         )
         self.username_text = arcade.Text(
-            username.upper(),
+            "...",
             right_center_x,
             WINDOW_HEIGHT - 80,
             RETRO_ACCENT,
@@ -515,7 +569,7 @@ class MainMenuView(arcade.View):
             font_name=RETRO_FONT,
         )
         self.subheader_text = arcade.Text(
-            f"Seu recorde: {best} pontos",
+            "Seu recorde: ...",
             right_center_x,
             WINDOW_HEIGHT - 110,
             RETRO_TEXT,
@@ -555,67 +609,76 @@ class MainMenuView(arcade.View):
         self.ui.add(self.btn_new_game)
         self.ui.add(self.btn_replay)
 
-        # vê se existe jogo salvo ativo
-        saved_state = repository.load_active_save(self.user_id)
-        if saved_state:
-            # mostra pro usuário que é continuação
-            self.btn_new_game.text = "CONTINUAR PARTIDA"
-
-            @self.btn_new_game.event("on_click")
-            def _start_classic(_):
+        @self.btn_new_game.event("on_click")
+        def _start_classic(_):
+            saved_state = self._saved_state
+            if saved_state is _UNSET:
+                # ainda não sabemos se há jogo salvo
+                return
+            if saved_state:
                 self.window.show_view(
                     PlayfieldView(user_id=self.user_id, loaded_state=saved_state)
                 )
-        else:
-            self.btn_new_game.text = "NOVO JOGO"
-
-            @self.btn_new_game.event("on_click")
-            def _start_classic(_):
+            else:
                 self.window.show_view(PlayfieldView(user_id=self.user_id))
 
         @self.btn_replay.event("on_click")
         def _open_replay(_):
             self.window.show_view(ReplaySelectView(self.user_id))
 
-    def _draw_playfield_frame(self):
-        pf_w = BOARD_WIDTH * CELL_SIZE
-        pf_h = BOARD_HEIGHT * CELL_SIZE
-        arcade.draw_lbwh_rectangle_filled(-6, -6, pf_w + 12, pf_h + 12, RETRO_PANEL_DARK)
-        arcade.draw_lbwh_rectangle_outline(
-            -6, -6, pf_w + 12, pf_h + 12, (60, 90, 80, 255), 3
-        )
-        arcade.draw_lbwh_rectangle_outline(
-            -9, -9, pf_w + 18, pf_h + 18, (20, 40, 34, 255), 3
-        )
-        for r in range(BOARD_HEIGHT + 1):
-            arcade.draw_line(
-                0, r * CELL_SIZE, pf_w, r * CELL_SIZE, (30, 60, 50, 255)
-            )
-        for c in range(BOARD_WIDTH + 1):
-            arcade.draw_line(
-                c * CELL_SIZE, 0, c * CELL_SIZE, pf_h, (30, 60, 50, 255)
-            )
+        self._refresh_header()
+        self._refresh_new_game_button()
 
-    def _draw_sidebar_background(self):
-        left = BOARD_WIDTH * CELL_SIZE
-        arcade.draw_lbwh_rectangle_filled(left, 0, SIDEBAR_WIDTH, WINDOW_HEIGHT, RETRO_PANEL)
-        arcade.draw_lbwh_rectangle_outline(
-            left, 0, SIDEBAR_WIDTH, WINDOW_HEIGHT, RETRO_ACCENT, 2
+    def on_update(self, delta_time: float):
+        self._loads.poll()
+
+    # ---------- dados vindos do banco ----------
+
+    def _on_user(self, user):
+        self.user = user or {"username": "Jogador"}
+        self._refresh_header()
+
+    def _on_best_score(self, best):
+        # o valor passado pela partida pode estar mais novo que o do banco
+        self.best_score = max(best or 0, self.best_score or 0)
+        self._best_loaded = True
+        self._refresh_header()
+
+    def _on_saved_state(self, saved_state):
+        self._saved_state = saved_state
+        self._refresh_new_game_button()
+
+    def _refresh_header(self):
+        if self.username_text and self.user is not None:
+            self.username_text.text = self.user["username"].upper()
+        if self.subheader_text and self._best_loaded:
+            self.subheader_text.text = f"Seu recorde: {self.best_score or 0} pontos"
+
+    def _refresh_new_game_button(self):
+        if not self.btn_new_game:
+            return
+        if self._saved_state is _UNSET:
+            self.btn_new_game.text = "CARREGANDO..."
+        elif self._saved_state:
+            # mostra pro usuário que é continuação
+            self.btn_new_game.text = "CONTINUAR PARTIDA"
+        else:
+            self.btn_new_game.text = "NOVO JOGO"
+
+    def _build_background(self, width, height):
+        return (
+            layers.window_frame(width, height, RETRO_BG, RETRO_PANEL_DARK, RETRO_ACCENT)
+            + layers.playfield_frame(
+                RETRO_PANEL_DARK, (60, 90, 80, 255), (20, 40, 34, 255), (30, 60, 50, 255)
+            )
+            + layers.sidebar_panel(height, RETRO_PANEL, RETRO_ACCENT)
         )
 
     def on_draw(self):
         self.clear()
 
-        arcade.draw_lbwh_rectangle_filled(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT, RETRO_BG)
-        arcade.draw_lbwh_rectangle_filled(
-            12, 12, WINDOW_WIDTH - 24, WINDOW_HEIGHT - 24, RETRO_PANEL_DARK
-        )
-        arcade.draw_lbwh_rectangle_outline(
-            12, 12, WINDOW_WIDTH - 24, WINDOW_HEIGHT - 24, RETRO_ACCENT, 3
-        )
-
-        self._draw_playfield_frame()
-        self._draw_sidebar_background()
+        # fundo, moldura do tabuleiro e painel lateral: cacheados na GPU
+        self.background.draw(self.window.width, self.window.height)
 
         if self.header_text:
             self.header_text.draw()
@@ -642,6 +705,15 @@ class ReplaySelectView(arcade.View):
         self.user_id = user_id
         self.info_text: arcade.Text | None = None
 
+        self._games = None  # None = ainda carregando
+        self._loads = PendingLoads()
+        self._loads.start(
+            user_id,
+            lambda: repository.get_user_recent_games(user_id, 10),
+            on_done=self._on_games,
+            default=[],
+        )
+
     def on_show_view(self):
         self.window.set_size(WINDOW_WIDTH, WINDOW_HEIGHT)
         arcade.set_background_color(RETRO_BG)
@@ -651,7 +723,7 @@ class ReplaySelectView(arcade.View):
         center_x = WINDOW_WIDTH / 2
 
         self.info_text = arcade.Text(
-            "Selecione uma partida para replay",
+            "Carregando partidas...",
             center_x,
             WINDOW_HEIGHT - 80,
             RETRO_ACCENT,
@@ -661,12 +733,55 @@ class ReplaySelectView(arcade.View):
             font_name=RETRO_FONT,
         )
 
-        games = repository.get_user_recent_games(self.user_id, limit=10)
+        btn_back = UIFlatButton(
+            text="VOLTAR",
+            width=160,
+            height=32,
+            style=RETRO_BUTTON_STYLE,
+        )
+        btn_back.center_x = center_x - 90
+        btn_back.center_y = 60
+        self.ui.add(btn_back)
+
+        # mural com as últimas partidas concluídas de todos os jogadores
+        btn_wall = UIFlatButton(
+            text="MURAL",
+            width=160,
+            height=32,
+            style=RETRO_BUTTON_STYLE,
+        )
+        btn_wall.center_x = center_x + 90
+        btn_wall.center_y = 60
+        self.ui.add(btn_wall)
+
+        @btn_back.event("on_click")
+        def _go_back(_):
+            self.window.show_view(MainMenuView(self.user_id))
+
+        @btn_wall.event("on_click")
+        def _open_wall(_):
+            self.window.show_view(SpectatorView(self.user_id))
+
+        if self._games is not None:
+            self._build_game_buttons()
+
+    def on_update(self, delta_time: float):
+        self._loads.poll()
+
+    def _on_games(self, games):
+        self._games = games or []
+        if self.info_text:
+            self._build_game_buttons()
+
+    def _build_game_buttons(self):
+        center_x = WINDOW_WIDTH / 2
+        games = self._games
         y = WINDOW_HEIGHT - 130
 
         if not games:
             self.info_text.text = "Você ainda não tem partidas concluídas."
         else:
+            self.info_text.text = "Selecione uma partida para replay"
             for g in games:
                 finished = g["finished_at"]
                 when = finished.strftime("%d/%m %H:%M") if finished else "?"
@@ -693,20 +808,6 @@ class ReplaySelectView(arcade.View):
 
                 self.ui.add(btn)
 
-        btn_back = UIFlatButton(
-            text="VOLTAR",
-            width=160,
-            height=32,
-            style=RETRO_BUTTON_STYLE,
-        )
-        btn_back.center_x = center_x
-        btn_back.center_y = 60
-        self.ui.add(btn_back)
-
-        @btn_back.event("on_click")
-        def _go_back(_):
-            self.window.show_view(MainMenuView(self.user_id))
-
     def on_draw(self):
         self.clear()
         arcade.draw_lbwh_rectangle_filled(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT, RETRO_BG)
@@ -728,6 +829,27 @@ class ReplaySelectView(arcade.View):
 # ============================================================
 #                             REPLAY
 # ============================================================
+
+# teclas de velocidade do replay (None = o mais rápido possível)
+REPLAY_SPEED_KEYS = {
+    arcade.key.KEY_1: 1.0,
+    arcade.key.KEY_2: 2.0,
+    arcade.key.KEY_3: 16.0,
+    arcade.key.KEY_4: None,
+}
+# no modo MAX, quanto tempo de cada quadro pode ir para a simulação
+REPLAY_MAX_FRAME_BUDGET = 0.012
+# quanto cada seta pula no replay (10 s)
+REPLAY_SEEK_TICKS = 10 * TICK_RATE
+
+
+def _load_replay_runner(game_id: int) -> replay.ReplayRunner:
+    """Roda no worker: seed + replay do banco, já montados num runner."""
+    rng_seed = repository.get_game_rng_seed(game_id)
+    data = repository.load_replay(game_id) or replay_codec.empty_replay()
+    return replay.ReplayRunner(TetrisGame(rng_seed=rng_seed), data)
+
+
 class ReplayView(arcade.View):
     """
     Tela de replay de uma partida.
@@ -741,14 +863,19 @@ class ReplayView(arcade.View):
 
         arcade.set_background_color(RETRO_BG)
 
-        # pega a seed do jogo no banco e recria o game garantindo a mesma sequência de peças
-        rng_seed = repository.get_game_rng_seed(game_id)
-        self.game = TetrisGame(rng_seed=rng_seed)
+        # seed + replay (eventos e keyframes para pular no tempo) chegam de
+        # um worker, como no mural; até lá o tabuleiro fica vazio
+        self.runner: replay.ReplayRunner | None = None
+        self._loads = PendingLoads()
+        self._loads.start(user_id, _load_replay_runner, game_id, on_done=self._on_runner)
+        self._tick_acc = 0.0
+        # velocidade do replay: multiplicador ou None = o mais rápido possível
+        self.speed: float | None = 1.0
 
-        # eventos de replay: lista de dicts {"t": float, "key": int}
-        self.events = repository.load_replay(game_id) or []
-        self.event_index = 0
-        self._start_time = time.time()
+        # blocos do tabuleiro em sprites; o runner troca de jogo ao pular no tempo
+        self.renderer = BoardRenderer(BLOCK_PALETTE)
+        self.board_slot = self.renderer.add_board(self.game, 0, 0, CELL_SIZE)
+        self.background = layers.StaticLayer(self._build_background)
 
         # coordenadas da sidebar
         self.sidebar_left = BOARD_WIDTH * CELL_SIZE
@@ -799,140 +926,402 @@ class ReplayView(arcade.View):
             anchor_y="top",
             font_name=RETRO_FONT,
         )
+        self.txt_speed = arcade.Text(
+            "",
+            left,
+            top - 70,
+            RETRO_TEXT,
+            10,
+            anchor_x="left",
+            anchor_y="top",
+            font_name=RETRO_FONT,
+        )
+        self.txt_speed_hint = arcade.Text(
+            "1: 1x  2: 2x  3: 16x  4: MAX",
+            left,
+            top - 90,
+            RETRO_TEXT,
+            9,
+            anchor_x="left",
+            anchor_y="top",
+            font_name=RETRO_FONT,
+        )
+        self.txt_seek_hint = arcade.Text(
+            "← →: -/+10s  HOME/END: início/fim",
+            left,
+            top - 106,
+            RETRO_TEXT,
+            9,
+            anchor_x="left",
+            anchor_y="top",
+            font_name=RETRO_FONT,
+        )
+
+        self.stats = StatsText(self.txt_score, self.txt_level, self.txt_lines)
+        self._refresh_speed_text()
+
+    @property
+    def game(self) -> TetrisGame | None:
+        # o runner troca o jogo ao restaurar um keyframe
+        return None if self.runner is None else self.runner.game
+
+    def _on_runner(self, runner):
+        self.runner = runner
 
     def on_show_view(self):
         self.window.set_size(WINDOW_WIDTH, WINDOW_HEIGHT)
 
+    def _build_background(self, width, height):
+        return (
+            layers.window_frame(width, height, RETRO_BG, RETRO_PANEL_DARK, RETRO_ACCENT)
+            + layers.playfield_frame(
+                RETRO_PANEL, (60, 90, 80, 255), (20, 40, 34, 255), (30, 60, 50, 255)
+            )
+            + layers.sidebar_panel(height, RETRO_PANEL, RETRO_ACCENT)
+        )
+
     def on_draw(self):
         self.clear()
-        # fundo + moldura geral
-        arcade.draw_lbwh_rectangle_filled(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT, RETRO_BG)
-        arcade.draw_lbwh_rectangle_filled(
-            12, 12, WINDOW_WIDTH - 24, WINDOW_HEIGHT - 24, RETRO_PANEL_DARK
-        )
-        arcade.draw_lbwh_rectangle_outline(
-            12, 12, WINDOW_WIDTH - 24, WINDOW_HEIGHT - 24, RETRO_ACCENT, 3
-        )
+        # fundo, moldura, grade e painel lateral: cacheados na GPU
+        self.background.draw(self.window.width, self.window.height)
 
         self._draw_playfield()
         self._draw_sidebar()
         self.info_text.draw()
 
     def _draw_playfield(self):
-        pf_w = BOARD_WIDTH * CELL_SIZE
-        pf_h = BOARD_HEIGHT * CELL_SIZE
+        self.board_slot.game = self.game
+        self.renderer.draw()
 
-        arcade.draw_lbwh_rectangle_filled(-6, -6, pf_w + 12, pf_h + 12, RETRO_PANEL)
-        arcade.draw_lbwh_rectangle_outline(
-            -6, -6, pf_w + 12, pf_h + 12, (60, 90, 80, 255), 3
-        )
-        arcade.draw_lbwh_rectangle_outline(
-            -9, -9, pf_w + 18, pf_h + 18, (20, 40, 34, 255), 3
+    def _refresh_speed_text(self):
+        self.txt_speed.text = "Velocidade: MAX" if self.speed is None else f"Velocidade: {self.speed:g}x"
+
+    def _draw_sidebar(self):
+        if self.game is not None:
+            self.stats.refresh(self.game)
+            self.stats.draw()
+        self.txt_speed.draw()
+        self.txt_speed_hint.draw()
+        self.txt_seek_hint.draw()
+
+    def on_update(self, delta_time: float):
+        self._loads.poll()
+        if self.runner is None:
+            return
+        # timeline do replay em ticks lógicos: a velocidade só muda
+        # quantos ticks rodam por quadro, nunca o resultado
+        if self.speed is None:
+            deadline = time.perf_counter() + REPLAY_MAX_FRAME_BUDGET
+            while not self.runner.finished and time.perf_counter() < deadline:
+                self.runner.advance(TICK_RATE)
+            return
+
+        self._tick_acc += delta_time * self.speed
+        ticks = int(self._tick_acc / TICK_DT)
+        self._tick_acc -= ticks * TICK_DT
+        self.runner.advance(ticks)
+
+    def on_key_press(self, key, modifiers):
+        if key in (arcade.key.ESCAPE, arcade.key.M):
+            self.window.show_view(MainMenuView(self.user_id))
+        elif key in REPLAY_SPEED_KEYS:
+            self.speed = REPLAY_SPEED_KEYS[key]
+            self._tick_acc = 0.0
+            self._refresh_speed_text()
+        elif self.runner is None:
+            return
+        elif key == arcade.key.LEFT:
+            self.runner.seek(self.game.tick_count - REPLAY_SEEK_TICKS)
+        elif key == arcade.key.RIGHT:
+            self.runner.seek(self.game.tick_count + REPLAY_SEEK_TICKS)
+        elif key == arcade.key.HOME:
+            self.runner.seek(0)
+        elif key == arcade.key.END:
+            self.runner.seek_end()
+
+# ============================================================
+#                    MURAL DE ESPECTADOR
+# ============================================================
+
+# quantos tabuleiros o mural mostra (as partidas concluídas mais recentes)
+SPECTATOR_BOARDS = 16
+SPECTATOR_WIDTH = 1280
+SPECTATOR_HEIGHT = 720
+
+
+def spectator_layout(n: int, width: float, height: float, top_margin: float = 40,
+                     margin: float = 16) -> list[tuple[float, float, float]]:
+    """
+    Posições (left, bottom, tamanho da célula) de `n` tabuleiros na área
+    dada, escolhendo o número de colunas que deixa as células maiores.
+    Cada tabuleiro reserva uma célula de folga dos lados e duas em cima
+    (rótulo).
+    """
+    if n <= 0:
+        return []
+    avail_w = width - 2 * margin
+    avail_h = height - top_margin - margin
+    best_cols, best_cell = 1, 0.0
+    for cols in range(1, n + 1):
+        rows = -(-n // cols)
+        cell = min(avail_w / (cols * (BOARD_WIDTH + 1)), avail_h / (rows * (BOARD_HEIGHT + 2)))
+        if cell > best_cell:
+            best_cols, best_cell = cols, cell
+    cell = int(best_cell) or best_cell
+    tile_w = (BOARD_WIDTH + 1) * cell
+    tile_h = (BOARD_HEIGHT + 2) * cell
+    rows = -(-n // best_cols)
+    # centraliza o mural na área livre
+    x0 = margin + (avail_w - best_cols * tile_w) / 2 + cell / 2
+    y_top = height - top_margin - (avail_h - rows * tile_h) / 2
+    tiles = []
+    for i in range(n):
+        r, c = divmod(i, best_cols)
+        tiles.append((x0 + c * tile_w, y_top - (r + 1) * tile_h, cell))
+    return tiles
+
+
+class SpectatorView(arcade.View):
+    """
+    Mural com vários tabuleiros ao mesmo tempo (telão de torneio).
+
+    Cada vaga recebe qualquer fonte com `.game` e `advance(ticks)`; hoje são
+    ReplayRunners das partidas concluídas mais recentes, carregados em
+    segundo plano. Todos os tabuleiros saem de um BoardRenderer só (uma
+    SpriteList), e os rótulos ficam num batch do pyglet.
+    """
+
+    def __init__(self, user_id: int, game_ids: list[int] | None = None):
+        super().__init__()
+        self.user_id = user_id
+        self.sources: list = []
+        self.game_ids: list[int] = []
+        self.speed: float | None = 1.0
+        self._tick_acc = 0.0
+
+        self.renderer: BoardRenderer | None = None
+        self._slots: list = []
+        self._labels: list[arcade.Text] = []
+        self._label_seen: list = []
+        self._label_batch = None
+        self._tiles: list = []
+        self._wall_key = None
+        self.background = layers.StaticLayer(self._build_background)
+
+        self.title = arcade.Text(
+            "Mural: carregando partidas...",
+            SPECTATOR_WIDTH / 2,
+            SPECTATOR_HEIGHT - 20,
+            RETRO_ACCENT,
+            11,
+            anchor_x="center",
+            anchor_y="center",
+            font_name=RETRO_FONT,
         )
-        for r in range(BOARD_HEIGHT + 1):
-            arcade.draw_line(
-                0, r * CELL_SIZE, pf_w, r * CELL_SIZE, (30, 60, 50, 255)
+
+        self._loads = PendingLoads()
+        if game_ids is None:
+            self._loads.start(
+                user_id,
+                lambda: repository.get_completed_games(SPECTATOR_BOARDS),
+                on_done=self._on_games,
+                default=[],
             )
-        for c in range(BOARD_WIDTH + 1):
-            arcade.draw_line(
-                c * CELL_SIZE, 0, c * CELL_SIZE, pf_h, (30, 60, 50, 255)
+        else:
+            self._set_games(list(game_ids))
+
+    def on_show_view(self):
+        self.window.set_size(SPECTATOR_WIDTH, SPECTATOR_HEIGHT)
+        arcade.set_background_color(RETRO_BG)
+
+    # ---------- fontes ----------
+
+    def _on_games(self, games):
+        self._set_games([g["id"] for g in games or []])
+
+    def _set_games(self, game_ids: list[int]):
+        self.game_ids = game_ids
+        self.sources = [None] * len(game_ids)
+        self._wall_key = None
+        self._refresh_title()
+        for i, gid in enumerate(game_ids):
+            # uma chave por jogo: os carregamentos se espalham pelos workers
+            self._loads.start(
+                gid, _load_replay_runner, gid,
+                on_done=lambda runner, i=i: self._on_source(i, runner),
             )
 
-        # células fixas do tabuleiro
-        for r in range(self.game.board.height):
-            for c in range(self.game.board.width):
-                val = self.game.board.get_cell(r, c)
-                if val:
-                    cx = c * CELL_SIZE + CELL_SIZE / 2
-                    cy = (BOARD_HEIGHT - 1 - r) * CELL_SIZE + CELL_SIZE / 2
-                    draw_block_8bit(cx - CELL_SIZE / 2, cy - CELL_SIZE / 2, CELL_SIZE, val)
-
-        # peça atual
-        s = self.game.current.shape
-        color = self.game.current.color
-        for r in range(len(s)):
-            for c in range(len(s[0])):
-                if s[r][c]:
-                    bx = self.game.current.x + c
-                    by = self.game.current.y + r
-                    cx = bx * CELL_SIZE + CELL_SIZE / 2
-                    cy = (BOARD_HEIGHT - 1 - by) * CELL_SIZE + CELL_SIZE / 2
-                    draw_block_8bit(cx - CELL_SIZE / 2, cy - CELL_SIZE / 2, CELL_SIZE, color)
+    def _on_source(self, index: int, runner):
+        if runner is not None:
+            self.sources[index] = runner
 
-    def _draw_sidebar(self):
-        left = self.sidebar_left
-        arcade.draw_lbwh_rectangle_filled(left, 0, SIDEBAR_WIDTH, WINDOW_HEIGHT, RETRO_PANEL)
-        arcade.draw_lbwh_rectangle_outline(
-            left, 0, SIDEBAR_WIDTH, WINDOW_HEIGHT, RETRO_ACCENT, 2
+    def _refresh_title(self):
+        speed = "MAX" if self.speed is None else f"{self.speed:g}x"
+        self.title.text = (
+            f"Mural: {len(self.game_ids)} partidas  |  {speed}  |  1-4: velocidade  ESC/M: voltar"
         )
 
-        self.txt_score.text = f"Pontuação: {self.game.score}"
-        self.txt_level.text = f"Nível: {self.game.level}"
-        self.txt_lines.text = f"Linhas: {self.game.lines}"
+    # ---------- layout ----------
+
+    def _ensure_wall(self):
+        """(Re)monta sprites, rótulos e molduras quando o tamanho ou o nº de vagas muda."""
+        width, height = self.window.width, self.window.height
+        key = (width, height, len(self.sources))
+        if key == self._wall_key:
+            return
+        self._wall_key = key
+        self._tiles = spectator_layout(len(self.sources), width, height)
+
+        self._label_batch = Batch()
+        self.renderer = BoardRenderer(BLOCK_PALETTE)
+        self._slots = []
+        self._labels = []
+        self._label_seen = [None] * len(self._tiles)
+        for left, bottom, cell in self._tiles:
+            self._slots.append(self.renderer.add_board(None, left, bottom, cell))
+            self._labels.append(arcade.Text(
+                "",
+                left,
+                bottom + BOARD_HEIGHT * cell + cell * 0.4,
+                RETRO_TEXT,
+                max(6, int(cell * 0.6)),
+                anchor_x="left",
+                anchor_y="bottom",
+                batch=self._label_batch,
+            ))
+        self.title.position = (width / 2, height - 20)
+        self.background.invalidate()
+
+    def _build_background(self, width, height):
+        shapes = layers.window_frame(width, height, RETRO_BG, RETRO_PANEL_DARK, RETRO_ACCENT)
+        for left, bottom, cell in self._tiles:
+            shapes += layers.playfield_frame(
+                RETRO_PANEL, (60, 90, 80, 255), (20, 40, 34, 255), (30, 60, 50, 255),
+                left, bottom, cell,
+            )
+        return shapes
 
-        self.txt_score.draw()
-        self.txt_level.draw()
-        self.txt_lines.draw()
+    # ---------- ciclo ----------
 
     def on_update(self, delta_time: float):
-        # timeline do replay baseada no tempo desde o início
-        elapsed = time.time() - self._start_time
-
-        # aplica todos os eventos cujo tempo já passou
-        while (
-            self.event_index < len(self.events)
-            and self.events[self.event_index]["t"] <= elapsed
-        ):
-            ev = self.events[self.event_index]
-            self._apply_event(ev)
-            self.event_index += 1
-
-        # avança gravidade normalmente
-        self.game.tick(delta_time)
-
-    def _apply_event(self, ev: dict):
-        key = ev.get("key")
-        if key == arcade.key.LEFT:
-            self.game.move_left()
-        elif key == arcade.key.RIGHT:
-            self.game.move_right()
-        elif key == arcade.key.DOWN:
-            self.game.soft_drop()
-        elif key in (arcade.key.UP, arcade.key.X, arcade.key.W):
-            self.game.rotate()
-        elif key == arcade.key.SPACE:
-            self.game.hard_drop()
+        self._loads.poll()
+        live = [s for s in self.sources if s is not None and not s.finished]
+        if not live:
+            return
+        if self.speed is None:
+            # MAX: reparte o orçamento do quadro entre os tabuleiros
+            deadline = time.perf_counter() + REPLAY_MAX_FRAME_BUDGET
+            while live and time.perf_counter() < deadline:
+                for src in live:
+                    src.advance(TICK_RATE // 4)
+                live = [s for s in live if not s.finished]
+            return
+
+        self._tick_acc += delta_time * self.speed
+        ticks = int(self._tick_acc / TICK_DT)
+        self._tick_acc -= ticks * TICK_DT
+        if ticks:
+            for src in live:
+                src.advance(ticks)
+
+    def _refresh_labels(self):
+        for i, src in enumerate(self.sources):
+            if src is None:
+                continue
+            game = src.game
+            seen = (game, game.stats_revision, game.game_over)
+            if seen == self._label_seen[i]:
+                continue
+            self._label_seen[i] = seen
+            status = "  FIM" if game.game_over else ""
+            self._labels[i].text = f"#{self.game_ids[i]}  {game.score} pts  N{game.level}{status}"
+
+    def on_draw(self):
+        self.clear()
+        self._ensure_wall()
+        self.background.draw(self.window.width, self.window.height)
+
+        for slot, src in zip(self._slots, self.sources):
+            slot.game = None if src is None else src.game
+        self.renderer.draw()
+
+        self._refresh_labels()
+        self._label_batch.draw()
+        self.title.draw()
 
     def on_key_press(self, key, modifiers):
         if key in (arcade.key.ESCAPE, arcade.key.M):
             self.window.show_view(MainMenuView(self.user_id))
+        elif key in REPLAY_SPEED_KEYS:
+            self.speed = REPLAY_SPEED_KEYS[key]
+            self._tick_acc = 0.0
+            self._refresh_title()
+
 
 # ============================================================
 #                        TELA DO TABULEIRO
 # ============================================================
 
 
+def _with_game_id(name: str, game_id):
+    """
+    Escrita da partida (função `name` de local_store) que precisa do id do
+    jogo. Vai para a fila do mesmo usuário que o start_game, então quando
+    roda o Future `game_id` já está resolvido (None se o registro falhou).
+    A função é buscada no worker: o import preguiçoso não roda na janela.
+    """
+    def job(**kwargs):
+        return getattr(local_store, name)(game_id=game_id.result(), **kwargs)
+
+    job.__name__ = name
+    return job
+
+
 class PlayfieldView(arcade.View):
     """
     Tabuleiro principal do Tetris, ligado ao backend de jogo e repositório.
     """
 
-    def __init__(self, user_id: int, loaded_state: dict | None = None):
+    def __init__(self, user_id: int, loaded_state: bytes | dict | None = None):
         super().__init__()
         arcade.set_background_color(RETRO_BG)
 
         self.user_id = user_id
-        self.rng_seed = int(time.time_ns())
 
         if loaded_state is not None:
             self.game = state_codec.state_to_game(loaded_state)
+            # partida retomada não sai de uma seed: o jogo fica sem seed no
+            # banco e a auditoria a marca como não verificável
+            self.rng_seed = None
         else:
+            self.rng_seed = int(time.time_ns())
             self.game = TetrisGame(rng_seed=self.rng_seed)
 
-        self.game_id = repository.start_game(self.user_id, self.rng_seed)
+        # o registro da partida (id local; o MySQL recebe pelo sync) roda no
+        # worker do usuário: as escritas seguintes entram na mesma fila e
+        # pegam o id deste Future
+        self._game_id = persistence.fetch(
+            self.user_id, lambda: local_store.start_game(self.user_id, self.rng_seed)
+        )
         self._start_time = time.time()
         self._finished_persisted = False
-        self._replay_events: list[dict] = []
+        self._recorder = replay.ReplayRecorder()
+        # partida retomada não sai da seed: o replay começa deste estado
+        self._recorder.start(self.game)
+        self._replay_chunk_seq = 0
+        self._tick_acc = 0.0
+
+        # tabuleiro e próxima peça (meia escala) numa SpriteList só
+        self.renderer = BoardRenderer(BLOCK_PALETTE)
+        self.renderer.add_board(self.game, 0, 0, CELL_SIZE, ghost=True)
+        preview_cell = CELL_SIZE * 0.5
+        self.renderer.add_next_piece(
+            self.game,
+            BOARD_WIDTH * CELL_SIZE + 20,
+            WINDOW_HEIGHT - 150 - NEXT_PREVIEW_SIZE * preview_cell,
+            preview_cell,
+        )
+        self.background = layers.StaticLayer(self._build_background)
 
         left = BOARD_WIDTH * CELL_SIZE + 10
         top = WINDOW_HEIGHT - 20
@@ -941,6 +1330,7 @@ class PlayfieldView(arcade.View):
         self.txt_lines = arcade.Text("", left, top - 48, RETRO_TEXT, 14, anchor_x="left", anchor_y="top")
         self.txt_speed = arcade.Text("", left, top - 72, RETRO_TEXT, 12, anchor_x="left", anchor_y="top")
         self.txt_next = arcade.Text("Próxima:", left, top - 104, RETRO_TEXT, 14, anchor_x="left", anchor_y="top")
+        self.stats = StatsText(self.txt_score, self.txt_level, self.txt_lines)
 
         base_y = 120
         self.txt_controls = [
@@ -995,6 +1385,8 @@ class PlayfieldView(arcade.View):
 
     def on_draw(self):
         self.clear()
+        # moldura, grade e painel lateral: cacheados na GPU
+        self.background.draw(self.window.width, self.window.height)
         self._draw_playfield()
         self._draw_sidebar()
 
@@ -1011,105 +1403,84 @@ class PlayfieldView(arcade.View):
             )
             self.txt_game_over.draw()
 
-    def _draw_playfield(self):
-        pf_w = BOARD_WIDTH * CELL_SIZE
-        pf_h = BOARD_HEIGHT * CELL_SIZE
-        arcade.draw_lbwh_rectangle_filled(-6, -6, pf_w + 12, pf_h + 12, RETRO_PANEL_DARK)
-        arcade.draw_lbwh_rectangle_outline(
-            -6, -6, pf_w + 12, pf_h + 12, (80, 80, 80, 255), 3
-        )
-        arcade.draw_lbwh_rectangle_outline(
-            -9, -9, pf_w + 18, pf_h + 18, (30, 30, 30, 255), 3
+    def _build_background(self, width, height):
+        return (
+            layers.playfield_frame(
+                RETRO_PANEL_DARK, (80, 80, 80, 255), (30, 30, 30, 255), (40, 40, 40, 255)
+            )
+            + layers.sidebar_panel(height, RETRO_PANEL, RETRO_ACCENT)
         )
 
-        for r in range(BOARD_HEIGHT + 1):
-            arcade.draw_line(0, r * CELL_SIZE, pf_w, r * CELL_SIZE, (40, 40, 40, 255))
-        for c in range(BOARD_WIDTH + 1):
-            arcade.draw_line(c * CELL_SIZE, 0, c * CELL_SIZE, pf_h, (40, 40, 40, 255))
-
-        for r in range(self.game.board.height):
-            for c in range(self.game.board.width):
-                val = self.game.board.get_cell(r, c)
-                if val:
-                    cx = c * CELL_SIZE + CELL_SIZE / 2
-                    cy = (BOARD_HEIGHT - 1 - r) * CELL_SIZE + CELL_SIZE / 2
-                    draw_block_8bit(cx - CELL_SIZE / 2, cy - CELL_SIZE / 2, CELL_SIZE, val)
-
-        s = self.game.current.shape
-        color = self.game.current.color
-        for r in range(len(s)):
-            for c in range(len(s[0])):
-                if s[r][c]:
-                    bx = self.game.current.x + c
-                    by = self.game.current.y + r
-                    cx = bx * CELL_SIZE + CELL_SIZE / 2
-                    cy = (BOARD_HEIGHT - 1 - by) * CELL_SIZE + CELL_SIZE / 2
-                    draw_block_8bit(cx - CELL_SIZE / 2, cy - CELL_SIZE / 2, CELL_SIZE, color)
+    def _draw_playfield(self):
+        # tabuleiro e próxima peça: só o que mudou desde o último quadro
+        self.renderer.draw()
 
     def _draw_sidebar(self):
-        left = BOARD_WIDTH * CELL_SIZE
-        arcade.draw_lbwh_rectangle_filled(left, 0, SIDEBAR_WIDTH, WINDOW_HEIGHT, RETRO_PANEL)
-        arcade.draw_lbwh_rectangle_outline(
-            left, 0, SIDEBAR_WIDTH, WINDOW_HEIGHT, RETRO_ACCENT, 2
-        )
+        if self.stats.refresh(self.game):
+            self.txt_speed.text = f"Velocidade: {1.0 / self.game.fall_interval():.2f} quedas/s"
 
-        self.txt_score.text = f"Pontuação: {self.game.score}"
-        self.txt_level.text = f"Nível: {self.game.level}"
-        self.txt_lines.text = f"Linhas: {self.game.lines}"
-        self.txt_speed.text = f"Velocidade: {1.0 / self.game.fall_interval():.2f} quedas/s"
-
-        self.txt_score.draw()
-        self.txt_level.draw()
-        self.txt_lines.draw()
+        self.stats.draw()
         self.txt_speed.draw()
         self.txt_next.draw()
         for t in self.txt_controls:
             t.draw()
 
-        s = self.game.next_piece.shape
-        color = self.game.next_piece.color
-        scale = 0.5
-        px = left + 20
-        py_top = WINDOW_HEIGHT - 150
-        for r in range(len(s)):
-            for c in range(len(s[0])):
-                if s[r][c]:
-                    cx = px + c * CELL_SIZE * scale + (CELL_SIZE * scale) / 2
-                    cy = py_top - r * CELL_SIZE * scale - (CELL_SIZE * scale) / 2
-                    draw_block_8bit(
-                        cx - (CELL_SIZE * scale) / 2,
-                        cy - (CELL_SIZE * scale) / 2,
-                        CELL_SIZE * scale,
-                        color,
-                    )
-
     def on_update(self, delta_time: float):
-        self.game.tick(delta_time)
+        # passo fixo: o jogo só avança em ticks lógicos inteiros
+        self._tick_acc += delta_time
+        while self._tick_acc >= TICK_DT:
+            self._tick_acc -= TICK_DT
+            self.game.step()
+            self._recorder.after_step(self.game)
+
+        # replay vai para o banco em pedaços durante a partida
+        if not self.game.game_over and self._recorder.chunk_ready():
+            self._flush_replay_chunk()
 
         if self.game.game_over and not self._finished_persisted:
             self._finished_persisted = True
             now = time.time()
             duration_ms = int((now - self._start_time) * 1000)
 
-            repository.finish_game(
-                self.game_id,
+            # fecha a partida e grava o último pedaço (pequeno) do replay
+            # numa transação só
+            persistence.submit(
+                self.user_id,
+                _with_game_id("finalize_game", self._game_id),
                 user_id=self.user_id,
                 final_score=self.game.score,
                 lines=self.game.lines,
                 level=self.game.level,
                 duration_ms=duration_ms,
                 status="completed",
+                replay=self._recorder.take_chunk(),
+                replay_seq=self._replay_chunk_seq,
             )
-            repository.save_replay(self.game_id, self._replay_events)
+            self._replay_chunk_seq += 1
+
+    def _flush_replay_chunk(self):
+        persistence.submit(
+            self.user_id,
+            _with_game_id("save_replay_chunk", self._game_id),
+            user_id=self.user_id,
+            seq=self._replay_chunk_seq,
+            chunk=self._recorder.take_chunk(),
+        )
+        self._replay_chunk_seq += 1
 
     def on_key_press(self, key, modifiers):
         # salvar e voltar pro menu (M ou ESC)
         if key in (arcade.key.M, arcade.key.ESCAPE):
             # garante que o jogo não volte “pausado” quando continuar
             self.game.paused = False
-            state = state_codec.game_to_state(self.game)
-            repository.upsert_saved_game(self.user_id, self.game_id, state)
-            self.window.show_view(MainMenuView(user_id=self.user_id))
+            state = save_codec.encode_game(self.game)
+            persistence.submit(
+                self.user_id,
+                _with_game_id("upsert_saved_game", self._game_id),
+                user_id=self.user_id,
+                state=state,
+            )
+            self.window.show_view(MainMenuView(user_id=self.user_id, saved_state=state))
             return
 
         if key == arcade.key.P:
@@ -1118,25 +1489,21 @@ class PlayfieldView(arcade.View):
 
         if self.game.game_over:
             if key == arcade.key.R:
-                self.window.show_view(MainMenuView(user_id=self.user_id))
+                self.window.show_view(
+                    MainMenuView(
+                        user_id=self.user_id,
+                        saved_state=None,
+                        best_score=self.game.score,
+                    )
+                )
             return
 
         if self.game.paused:
             return
 
-        # registra evento pro replay
-        if key in (
-            arcade.key.LEFT,
-            arcade.key.RIGHT,
-            arcade.key.DOWN,
-            arcade.key.UP,
-            arcade.key.X,
-            arcade.key.W,
-            arcade.key.SPACE,
-        ):
-            self._replay_events.append(
-                {"t": time.time() - self._start_time, "key": key}
-            )
+        # registra evento pro replay no tick lógico atual
+        if key in replay.REPLAY_KEYS:
+            self._recorder.record_key(self.game, key)
 
         if key == arcade.key.LEFT:
             self.game.move_left()
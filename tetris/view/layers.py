@@ -0,0 +1,98 @@
+# tetris/view/layers.py
+"""
+Camada estática das telas (fundo, molduras, grade, painel lateral).
+
+Essa geometria nunca muda durante a tela, então vai para a GPU uma vez numa
+`ShapeElementList` e sai numa chamada de desenho por quadro. Só é refeita
+quando o tamanho da janela muda. O que se mexe (blocos, textos, UI) é
+desenhado por cima.
+"""
+from __future__ import annotations
+
+from arcade import shape_list
+
+from tetris.core.constants import BOARD_WIDTH, BOARD_HEIGHT, CELL_SIZE, SIDEBAR_WIDTH
+
+
+def rect_filled(left: float, bottom: float, width: float, height: float, color) -> shape_list.Shape:
+    return shape_list.create_rectangle_filled(
+        left + width / 2, bottom + height / 2, width, height, color
+    )
+
+
+def rect_outline(left: float, bottom: float, width: float, height: float, color,
+                 border_width: float = 1) -> shape_list.Shape:
+    return shape_list.create_rectangle_outline(
+        left + width / 2, bottom + height / 2, width, height, color, border_width
+    )
+
+
+# ---------- peças de cenário ----------
+
+def window_frame(width: float, height: float, bg, panel, accent) -> list:
+    """Fundo da janela com o painel interno e a borda de destaque."""
+    return [
+        rect_filled(0, 0, width, height, bg),
+        rect_filled(12, 12, width - 24, height - 24, panel),
+        rect_outline(12, 12, width - 24, height - 24, accent, 3),
+    ]
+
+
+def playfield_frame(panel, edge, outer_edge, grid, left: float = 0, bottom: float = 0,
+                    cell_size: float = CELL_SIZE) -> list:
+    """
+    Fundo do tabuleiro, as duas bordas e as linhas da grade, com o canto
+    inferior esquerdo em (left, bottom). Bordas e margens acompanham a escala.
+    """
+    pf_w = BOARD_WIDTH * cell_size
+    pf_h = BOARD_HEIGHT * cell_size
+    k = cell_size / CELL_SIZE
+    m1, m2, border = 6 * k, 9 * k, max(1.0, 3 * k)
+    shapes = [
+        rect_filled(left - m1, bottom - m1, pf_w + 2 * m1, pf_h + 2 * m1, panel),
+        rect_outline(left - m1, bottom - m1, pf_w + 2 * m1, pf_h + 2 * m1, edge, border),
+        rect_outline(left - m2, bottom - m2, pf_w + 2 * m2, pf_h + 2 * m2, outer_edge, border),
+    ]
+    for r in range(BOARD_HEIGHT + 1):
+        y = bottom + r * cell_size
+        shapes.append(shape_list.create_line(left, y, left + pf_w, y, grid))
+    for c in range(BOARD_WIDTH + 1):
+        x = left + c * cell_size
+        shapes.append(shape_list.create_line(x, bottom, x, bottom + pf_h, grid))
+    return shapes
+
+
+def sidebar_panel(height: float, panel, accent) -> list:
+    left = BOARD_WIDTH * CELL_SIZE
+    return [
+        rect_filled(left, 0, SIDEBAR_WIDTH, height, panel),
+        rect_outline(left, 0, SIDEBAR_WIDTH, height, accent, 2),
+    ]
+
+
+class StaticLayer:
+    """
+    Cache da geometria estática de uma tela.
+
+    `build(width, height)` devolve os shapes na ordem de pintura; todos são
+    faixas de triângulos, então a lista inteira vira um lote só e a ordem é
+    mantida.
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._shapes: shape_list.ShapeElementList | None = None
+        self._size: tuple | None = None
+
+    def invalidate(self) -> None:
+        self._shapes = None
+
+    def draw(self, width: float, height: float) -> None:
+        size = (width, height)
+        if self._shapes is None or self._size != size:
+            shapes = shape_list.ShapeElementList()
+            for shape in self._build(width, height):
+                shapes.append(shape)
+            self._shapes = shapes
+            self._size = size
+        self._shapes.draw()
@@ -0,0 +1,136 @@
+# tetris/view/renderer.py
+"""
+Desenho de tabuleiros em lote.
+
+`BoardRenderer` junta qualquer número de TetrisGame, cada um com posição e
+tamanho de célula próprios, numa SpriteList só: todos os tabuleiros (e as
+prévias da próxima peça) saem numa chamada de desenho. Cada vaga compara a
+revisão do jogo com a do último quadro e só recompõe o que mudou, então um
+mural de tabuleiros parados custa quase nada.
+"""
+from __future__ import annotations
+
+import arcade
+
+from tetris.core.constants import BOARD_WIDTH, BOARD_HEIGHT
+from tetris.view.blocks import BlockGrid, stamp_piece
+
+# a maior peça cabe numa caixa 4x4
+NEXT_PREVIEW_SIZE = 4
+
+
+def compose_board(game, out: bytearray, ghost_offset: int | None = None) -> bytearray:
+    """
+    Células fixas do tabuleiro com a peça atual por cima, em `out`.
+    Com `ghost_offset`, a peça fantasma (onde a atual vai travar) entra
+    antes, com id + ghost_offset.
+    """
+    board = game.board
+    out[:] = board.cells
+    piece = game.current
+    if ghost_offset is not None and not game.game_over:
+        # queda pelas alturas das colunas: O(largura), só quando a revisão muda
+        stamp_piece(out, board.width, board.height, piece, piece.x,
+                    piece.y + game.drop_distance(), piece.piece_id + ghost_offset)
+    stamp_piece(out, board.width, board.height, piece, piece.x, piece.y)
+    return out
+
+
+class BoardSlot:
+    """
+    Um tabuleiro no renderer. `game` pode ser trocado a qualquer momento
+    (o replay troca de jogo ao pular no tempo); None deixa a vaga vazia.
+    """
+
+    def __init__(self, grid: BlockGrid, game=None, ghost: bool = False):
+        self.grid = grid
+        self.game = game
+        self.ghost = ghost
+        self._cells = bytearray(grid.width * grid.height)
+        self._seen = None
+
+    def sync(self) -> None:
+        game = self.game
+        seen = None if game is None else (game, game.revision)
+        if seen == self._seen:
+            return
+        self._seen = seen
+        if game is None:
+            self._cells[:] = bytes(len(self._cells))
+        else:
+            compose_board(game, self._cells, self.grid.ghost_offset if self.ghost else None)
+        self.grid.update(self._cells)
+
+
+class NextPieceSlot(BoardSlot):
+    """Prévia da próxima peça: muda só quando uma peça trava (board_revision)."""
+
+    def sync(self) -> None:
+        game = self.game
+        seen = None if game is None else (game, game.board_revision)
+        if seen == self._seen:
+            return
+        self._seen = seen
+        cells = self._cells
+        cells[:] = bytes(len(cells))
+        if game is not None:
+            stamp_piece(cells, self.grid.width, self.grid.height, game.next_piece, 0, 0)
+        self.grid.update(cells)
+
+
+class BoardRenderer:
+    def __init__(self, palette):
+        self.palette = palette
+        self.sprite_list = arcade.SpriteList()
+        self.slots: list[BoardSlot] = []
+
+    def add_board(self, game, left: float, bottom: float, cell_size: float,
+                  ghost: bool = False) -> BoardSlot:
+        """Tabuleiro com o canto inferior esquerdo em (left, bottom); `ghost` mostra a peça fantasma."""
+        grid = BlockGrid(BOARD_WIDTH, BOARD_HEIGHT, cell_size, left, bottom,
+                         self.palette, self.sprite_list)
+        slot = BoardSlot(grid, game, ghost)
+        self.slots.append(slot)
+        return slot
+
+    def add_next_piece(self, game, left: float, bottom: float, cell_size: float) -> NextPieceSlot:
+        grid = BlockGrid(NEXT_PREVIEW_SIZE, NEXT_PREVIEW_SIZE, cell_size, left, bottom,
+                         self.palette, self.sprite_list)
+        slot = NextPieceSlot(grid, game)
+        self.slots.append(slot)
+        return slot
+
+    def update(self) -> None:
+        for slot in self.slots:
+            slot.sync()
+
+    def draw(self) -> None:
+        self.update()
+        self.sprite_list.draw(pixelated=True)
+
+
+class StatsText:
+    """
+    Pontuação, nível e linhas de um jogo em arcade.Text. Trocar o texto
+    refaz o layout no pyglet, então só acontece quando o placar muda.
+    """
+
+    def __init__(self, score: arcade.Text, level: arcade.Text, lines: arcade.Text):
+        self.texts = (score, level, lines)
+        self._seen = None
+
+    def refresh(self, game) -> bool:
+        """Atualiza os textos se o placar mudou; retorna True quando mudou."""
+        seen = (game, game.stats_revision)
+        if seen == self._seen:
+            return False
+        self._seen = seen
+        score, level, lines = self.texts
+        score.text = f"Pontuação: {game.score}"
+        level.text = f"Nível: {game.level}"
+        lines.text = f"Linhas: {game.lines}"
+        return True
+
+    def draw(self) -> None:
+        for t in self.texts:
+            t.draw()
@@ -0,0 +1,151 @@
+"""
+Auditoria headless de replays.
+
+Recria cada partida concluída a partir da seed e dos eventos gravados,
+sem janela nem arcade, e compara score/linhas/nível com a linha de `games`.
+
+Uso:
+    python verify_replays.py                 # últimas 1000 partidas
+    python verify_replays.py --limit 50000 --workers 8
+    python verify_replays.py --game 12 --game 40
+"""
+import argparse
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from db import db, repository
+from tetris.core import state_codec
+from tetris.core.replay import ReplayRunner, simulate_replay_chunks
+from tetris.models.game import TetrisGame
+
+
+def _init_worker():
+    # cada processo precisa das próprias conexões (não reaproveita as do pai)
+    if db.engine is not None:
+        db.engine.dispose(close=False)
+
+
+def _starts_from_seed(rng_seed: int | None, data: dict) -> bool:
+    """
+    Replay sem keyframe inicial: confere se o primeiro keyframe bate com a
+    simulação a partir da seed. Se não bate (ou não há keyframe), a partida
+    não começou da seed (ex.: retomada de um save) e não dá para julgar.
+    """
+    keyframes = data.get("keyframes") or []
+    if not keyframes:
+        return False
+    first = min(keyframes, key=lambda k: k["tick"])
+    runner = ReplayRunner(TetrisGame(rng_seed=rng_seed), dict(data, keyframes=[]))
+    runner.advance(first["tick"])
+    expected = state_codec.game_to_keyframe(state_codec.keyframe_to_game(first["state"]))
+    return state_codec.game_to_keyframe(runner.game) == expected
+
+
+def _matches_seed(rng_seed: int, keyframe: dict) -> bool:
+    """
+    O keyframe do tick 0 é escrito pelo cliente: só vale se for exatamente
+    o jogo novo dessa seed. Partidas retomadas de um save não têm seed.
+    """
+    state = state_codec.game_to_keyframe(state_codec.keyframe_to_game(keyframe["state"]))
+    return state == state_codec.game_to_keyframe(TetrisGame(rng_seed=rng_seed))
+
+
+def audit_replay(rng_seed: int | None, expected: tuple, chunks, load_full=None) -> dict:
+    """
+    Confere um replay (pedaços em ordem) contra (score, linhas, nível) gravados.
+    A simulação sempre parte da seed; o keyframe inicial só é comparado com
+    ela. `load_full()` traz o replay inteiro, usado só para julgar a
+    divergência de replays antigos, sem keyframe inicial.
+
+    "unverifiable": replay antigo gravado em segundos (conversão aproximada),
+    partida retomada de um save (sem seed) ou que não começou da seed.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return {"status": "missing"}
+    if first.get("legacy"):
+        return {"status": "unverifiable", "reason": "replay antigo por tempo"}
+    if rng_seed is None:
+        return {"status": "unverifiable", "reason": "partida retomada de um save"}
+
+    start = next((k for k in first.get("keyframes") or [] if k["tick"] == 0), None)
+    game = simulate_replay_chunks(rng_seed, itertools.chain([first], chunks))
+    result = {"expected": expected, "got": (game.score, game.lines, game.level)}
+    if start is not None and not _matches_seed(rng_seed, start):
+        return dict(result, status="mismatch", reason="keyframe inicial não bate com a seed")
+    if result["got"] == expected:
+        return dict(result, status="ok")
+    if start is None and load_full is not None:
+        data = load_full()
+        if data is not None and not _starts_from_seed(rng_seed, data):
+            return {"status": "unverifiable", "reason": "sem keyframe inicial"}
+    return dict(result, status="mismatch")
+
+
+def verify_game(row: dict) -> dict:
+    """Re-simula um jogo e devolve o resultado da comparação (ver audit_replay)."""
+    game_id = row["id"]
+    expected = (row["final_score"], row["lines_cleared"], row["level_reached"])
+    # os pedaços vêm do cursor um a um: a memória não cresce com a partida
+    try:
+        result = audit_replay(
+            row["rng_seed"], expected, repository.iter_replay(game_id),
+            load_full=lambda: repository.load_replay(game_id),
+        )
+    except Exception as e:
+        result = {"status": "error", "reason": str(e)}
+    return dict(result, id=game_id)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Verifica replays re-simulando as partidas.")
+    parser.add_argument("--game", type=int, action="append", dest="game_ids",
+                        help="id de jogo específico (pode repetir)")
+    parser.add_argument("--limit", type=int, default=1000,
+                        help="quantas partidas recentes verificar")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="processos em paralelo")
+    args = parser.parse_args(argv)
+
+    games = repository.get_completed_games(
+        limit=None if args.game_ids else args.limit,
+        game_ids=args.game_ids,
+    )
+    if not games:
+        print("[VERIFY] nenhuma partida encontrada.")
+        return 0
+
+    counts = {"ok": 0, "mismatch": 0, "missing": 0, "unverifiable": 0, "error": 0}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        for res in pool.map(verify_game, games, chunksize=16):
+            counts[res["status"]] += 1
+            if res["status"] == "mismatch":
+                exp_score, exp_lines, exp_level = res["expected"]
+                score, lines, level = res["got"]
+                print(
+                    f"[VERIFY] jogo #{res['id']} divergente: "
+                    f"score {exp_score} -> {score}, "
+                    f"linhas {exp_lines} -> {lines}, "
+                    f"nível {exp_level} -> {level}"
+                    + (f" ({res['reason']})" if "reason" in res else "")
+                )
+            elif res["status"] == "missing":
+                print(f"[VERIFY] jogo #{res['id']} sem replay gravado.")
+            elif res["status"] == "unverifiable":
+                print(f"[VERIFY] jogo #{res['id']} não verificável: {res['reason']}.")
+            elif res["status"] == "error":
+                print(f"[VERIFY] jogo #{res['id']} não pôde ser lido: {res['reason']}")
+
+    print(
+        f"[VERIFY] {len(games)} partidas: {counts['ok']} ok, "
+        f"{counts['mismatch']} divergentes, {counts['missing']} sem replay, "
+        f"{counts['unverifiable']} não verificáveis, {counts['error']} com erro de leitura."
+    )
+    return 1 if counts["mismatch"] or counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())